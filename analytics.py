@@ -0,0 +1,240 @@
+"""Corpus statistics on NumPy arrays.
+
+    python analytics.py [--year 2025] [--speaker student|teacher] [--top 20]
+
+CorpusStats builds a few columns once from the loaded corpus (the cached
+QuoteStore or snapshot, never a re-parse): packed dates, year and month,
+content length in characters, and whether the quote is a student exchange
+(a line starting with "S: "). Term counts come from the search index's
+postings, flattened into three arrays. Every query after that is a mask and
+a bincount/histogram over those arrays.
+
+>>> from analytics import CorpusStats
+>>> s = CorpusStats()
+>>> s.per_year()
+>>> s.top_terms(10, year=2025)
+"""
+import argparse
+
+import numpy as np
+
+import quote
+from quote import pack_date, _snapshot_record
+import stats
+
+SPEAKERS = ("student", "teacher")
+
+_record_dtype = np.dtype([("id", "<i8"), ("date", "<i4"), ("origin", "<u2"), ("pad", "V2"),
+                          ("offset", "<u8"), ("length", "<u4")])
+assert _record_dtype.itemsize == _snapshot_record.size
+
+# Includes the pieces \w+ leaves of contractions (don't -> don, t)
+STOPWORDS = frozenset("""
+a an and are as at be but by can d do don for from have he her his i if in is it its ll m re ve
+just me my no not of on or s so t that the them then there they this to up was
+we what when who why will with you your
+""".split())
+
+
+def _columns(quotes) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(packed dates, content byte offsets, content bytes) as NumPy arrays.
+
+    The arrays are copies, so the store can keep growing (extract_incremental)
+    or be closed after this returns.
+    """
+    if isinstance(quotes, quote.QuoteStore):
+        dates = np.frombuffer(quotes._dates, dtype=np.int32).copy()
+        offsets = np.frombuffer(quotes._offsets, dtype=np.uint64).astype(np.int64)
+        content = np.frombuffer(bytes(quotes._content), dtype=np.uint8)
+        return dates, offsets, content
+    if isinstance(quotes, quote.MappedQuoteStore):
+        n = len(quotes)
+        records = np.frombuffer(quotes._mm, dtype=_record_dtype, count=n, offset=quotes._records_offset)
+        dates = records["date"].astype(np.int32)
+        offsets = np.empty(n + 1, dtype=np.int64)
+        offsets[:-1] = records["offset"]
+        offsets[-1] = offsets[-2] + int(records["length"][-1]) if n else 0
+        del records
+        content = np.frombuffer(quotes._mm[quotes._content_offset:quotes._content_offset + int(offsets[-1])],
+                                dtype=np.uint8)
+        return dates, offsets, content
+    # Any other sequence of _quote objects
+    dates = np.fromiter((pack_date(q.date) for q in quotes), dtype=np.int32, count=len(quotes))
+    encoded = [q.content.encode("utf-8") for q in quotes]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+    return dates, offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+class CorpusStats:
+    def __init__(self, quotes=None, index=None):
+        """Columns over `quotes` (default: the cached corpus).
+
+        `index` is a search.SearchIndex over the same quotes; it is only
+        needed for top_terms() and defaults to the cached index when
+        `quotes` is the default corpus.
+        """
+        self._default = quotes is None
+        self.quotes = quote.get_quote_list() if quotes is None else quotes
+        self._index = index
+        self._terms: list[str] | None = None
+        self._postings: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None
+
+        dates, offsets, content = _columns(self.quotes)
+        n = len(dates)
+        self.dates = dates
+        self.years = np.where(dates >= 0, dates // 10000, -1).astype(np.int32)
+        self.months = ((dates % 10000) // 100).astype(np.int8)
+        starts = offsets[:-1]
+        # Characters = bytes minus UTF-8 continuation bytes
+        cont = np.flatnonzero((content & 0xC0) == 0x80)
+        self.lengths = (np.diff(offsets)
+                        - np.bincount(np.searchsorted(offsets, cont, side="right") - 1, minlength=n)[:n])
+        # "S: " at the start of the quote or of any line in it
+        if len(content) >= 3:
+            hits = np.flatnonzero((content[:-2] == ord("S")) & (content[1:-1] == ord(":"))
+                                  & (content[2:] == ord(" ")))
+            owner = np.searchsorted(offsets, hits, side="right") - 1
+            line_start = (hits == starts[owner]) | (content[np.maximum(hits - 1, 0)] == ord("\n"))
+            self.student = np.zeros(n, dtype=bool)
+            self.student[owner[line_start]] = True
+        else:
+            self.student = np.zeros(n, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def mask(self, year: int | None = None, speaker: str | None = None) -> np.ndarray:
+        """Boolean array selecting quotes from `year` and/or by `speaker`"""
+        m = np.ones(len(self.dates), dtype=bool)
+        if year is not None:
+            m &= self.years == year
+        if speaker is not None:
+            if speaker not in SPEAKERS:
+                raise ValueError(f"unknown speaker {speaker!r}, expected one of {SPEAKERS}")
+            m &= self.student if speaker == "student" else ~self.student
+        return m
+
+    @stats.timed("analytics_per_month")
+    def per_month(self, year: int | None = None, speaker: str | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """(yyyymm labels, counts) for every month between the first and last dated one.
+
+        Quotes without a month are left out.
+        """
+        m = self.mask(year, speaker) & (self.years >= 0) & (self.months > 0)
+        ym = self.years[m].astype(np.int64) * 12 + self.months[m] - 1
+        if not len(ym):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        lo = ym.min()
+        counts = np.bincount(ym - lo)
+        slots = np.arange(lo, lo + len(counts))
+        return (slots // 12) * 100 + slots % 12 + 1, counts
+
+    @stats.timed("analytics_per_year")
+    def per_year(self, speaker: str | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """(years, counts) for every year between the first and last dated one"""
+        y = self.years[self.mask(None, speaker) & (self.years >= 0)]
+        if not len(y):
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int64)
+        lo = y.min()
+        counts = np.bincount(y - lo)
+        return np.arange(lo, lo + len(counts)), counts
+
+    def growth(self, speaker: str | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """(years, year-over-year change in quote count); NaN where the year before had none"""
+        years, counts = self.per_year(speaker)
+        change = np.full(len(counts), np.nan)
+        prev = counts[:-1].astype(float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            change[1:] = np.where(prev > 0, (counts[1:] - prev) / prev, np.nan)
+        return years, change
+
+    @stats.timed("analytics_lengths")
+    def length_stats(self, year: int | None = None, speaker: str | None = None, bins: int = 20) -> dict:
+        """Summary and histogram of content length in characters"""
+        lengths = self.lengths[self.mask(year, speaker)]
+        if not len(lengths):
+            return {"count": 0}
+        counts, edges = np.histogram(lengths, bins=bins)
+        p50, p90, p99 = np.percentile(lengths, (50, 90, 99))
+        return {"count": int(len(lengths)), "mean": float(lengths.mean()), "median": float(p50),
+                "p90": float(p90), "p99": float(p99), "max": int(lengths.max()),
+                "histogram": counts, "edges": edges}
+
+    def _flat_postings(self) -> tuple[list[str], np.ndarray, np.ndarray, np.ndarray]:
+        """(terms, term ids, doc numbers, term frequencies) over every posting"""
+        if self._postings is None:
+            index = self._index
+            if index is None:
+                import search
+                if self._default:
+                    index = search.get_index()
+                else:
+                    index = search.SearchIndex()
+                    for i in range(len(self.quotes)):
+                        index.add(self.quotes[i].content)
+                self._index = index
+            self._terms = list(index.postings)
+            entries = list(index.postings.values())
+            sizes = np.fromiter((len(d) for d, _ in entries), dtype=np.int64, count=len(entries))
+            term_ids = np.repeat(np.arange(len(entries), dtype=np.int32), sizes)
+            docs = np.concatenate([np.frombuffer(d, dtype=np.uint32) for d, _ in entries]) \
+                if entries else np.empty(0, dtype=np.uint32)
+            tfs = np.concatenate([np.frombuffer(t, dtype=np.uint16) for _, t in entries]) \
+                if entries else np.empty(0, dtype=np.uint16)
+            self._postings = (term_ids, docs, tfs)
+        return (self._terms, *self._postings)
+
+    @stats.timed("analytics_terms")
+    def top_terms(self, n: int = 20, year: int | None = None, speaker: str | None = None,
+                  stopwords: frozenset = STOPWORDS) -> list[tuple[str, int]]:
+        """Most frequent words, counting every occurrence"""
+        terms, term_ids, docs, tfs = self._flat_postings()
+        if year is None and speaker is None:
+            counts = np.bincount(term_ids, weights=tfs, minlength=len(terms))
+        else:
+            keep = self.mask(year, speaker)[docs]
+            counts = np.bincount(term_ids[keep], weights=tfs[keep], minlength=len(terms))
+        if stopwords:
+            counts[[i for i, t in enumerate(terms) if t in stopwords]] = 0
+        n = min(n, int(np.count_nonzero(counts)))
+        if n <= 0:
+            return []
+        top = np.argpartition(counts, -n)[-n:]
+        top = top[np.argsort(-counts[top], kind="stable")]
+        return [(terms[i], int(counts[i])) for i in top]
+
+    def report(self, year: int | None = None, speaker: str | None = None, top: int = 20) -> str:
+        lines = [f"{int(self.mask(year, speaker).sum())} quotes "
+                 f"({int(self.student.sum())} student exchanges in the whole corpus)"]
+        years, counts = self.per_year(speaker)
+        _, change = self.growth(speaker)
+        lines.append("\nPer year:")
+        for y, c, g in zip(years, counts, change):
+            lines.append(f"  {y}: {c:7d}" + ("" if np.isnan(g) else f"  ({g:+.0%})"))
+        months, counts = self.per_month(year, speaker)
+        if len(months):
+            lines.append("\nPer month:")
+            peak = counts.max() or 1
+            for ym, c in zip(months, counts):
+                lines.append(f"  {ym // 100}-{ym % 100:02d}: {c:7d} {'#' * int(40 * c / peak)}")
+        ls = self.length_stats(year, speaker)
+        if ls["count"]:
+            lines.append(f"\nLength (characters): mean {ls['mean']:.0f}, median {ls['median']:.0f}, "
+                         f"p90 {ls['p90']:.0f}, p99 {ls['p99']:.0f}, max {ls['max']}")
+        lines.append("\nTop words:")
+        lines.extend(f"  {t:<20} {c}" for t, c in self.top_terms(top, year, speaker))
+        return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Corpus statistics")
+    parser.add_argument("--year", type=int)
+    parser.add_argument("--speaker", choices=SPEAKERS)
+    parser.add_argument("--top", type=int, default=20, help="number of top words to list")
+    args = parser.parse_args(argv)
+    print(CorpusStats().report(args.year, args.speaker, args.top))
+
+
+if __name__ == "__main__":
+    main()
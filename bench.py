@@ -0,0 +1,848 @@
+"""Benchmarks for the quote extraction and daily quote hot paths.
+
+Run everything:
+
+    python bench.py
+
+or a single benchmark:
+
+    python bench.py import
+"""
+import itertools
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+_here = os.path.dirname(os.path.abspath(__file__))
+
+
+def _timeit(fn, repeat: int = 5) -> float:
+    """Best wall time of `repeat` calls, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench_import(repeat: int = 5) -> dict:
+    """Startup time of `import quote; quote.quote_list`, cold vs warm cache.
+
+    Runs in a temporary copy of the repository so the real cache is untouched.
+    Cold means the cache metadata is missing and the text file is re-parsed;
+    warm means quotes.json is loaded directly.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ("quote.py", "stats.py", "Jordi's Famous quotes.txt", "quotes.json"):
+            shutil.copy(os.path.join(_here, name), tmp)
+        cmd = [sys.executable, "-c", "import quote; quote.quote_list"]
+        cache = os.path.join(tmp, ".quotes_cache.json")
+
+        def cold():
+            if os.path.exists(cache):
+                os.remove(cache)
+            subprocess.run(cmd, cwd=tmp, check=True)
+
+        def warm():
+            subprocess.run(cmd, cwd=tmp, check=True)
+
+        def bare():
+            subprocess.run([sys.executable, "-c", "import quote"], cwd=tmp, check=True)
+
+        results = {
+            "cold_s": _timeit(cold, repeat),
+            "warm_s": _timeit(warm, repeat),
+            "import_only_s": _timeit(bare, repeat),
+        }
+    print(f"import quote (no access):   {results['import_only_s'] * 1000:8.2f} ms")
+    print(f"quote_list, cold cache:     {results['cold_s'] * 1000:8.2f} ms")
+    print(f"quote_list, warm cache:     {results['warm_s'] * 1000:8.2f} ms")
+    return results
+
+
+def bench_startup(repeat: int = 5, top: int = 15) -> dict:
+    """Wall time of `dailyquote.py today` and where its imports spend it.
+
+    Uses the real cache, so run once beforehand to make sure it is warm.
+    The breakdown comes from `python -X importtime` and lists the modules
+    with the most time spent in their own top-level code.
+    """
+    script = os.path.join(_here, "dailyquote.py")
+    quiet = {"stdout": subprocess.DEVNULL, "check": True, "cwd": _here}
+    results = {
+        "python_s": _timeit(lambda: subprocess.run([sys.executable, "-c", "pass"], **quiet), repeat),
+        "today_s": _timeit(lambda: subprocess.run([sys.executable, script, "today"], **quiet), repeat),
+    }
+    out = subprocess.run([sys.executable, "-X", "importtime", script, "today"], cwd=_here,
+                         capture_output=True, text=True, check=True).stderr
+    modules = []
+    for line in out.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((int(self_us), int(cumulative_us), name.rstrip()))
+    results["imports_s"] = sum(m[0] for m in modules) / 1e6
+    results["modules"] = {name.strip(): self_us / 1e6 for self_us, _, name in modules}
+    print(f"python -c pass:          {results['python_s'] * 1000:8.2f} ms")
+    print(f"dailyquote.py today:     {results['today_s'] * 1000:8.2f} ms")
+    print(f"  imports ({len(modules)} modules): {results['imports_s'] * 1000:8.2f} ms")
+    print(f"  {'self ms':>8} {'cumul ms':>9}  module")
+    for self_us, cumulative_us, name in sorted(modules, reverse=True)[:top]:
+        print(f"  {self_us / 1000:8.2f} {cumulative_us / 1000:9.2f}  {name}")
+    return results
+
+
+def write_synthetic_corpus(path: str, n: int, seed: int = 0) -> None:
+    """Write `n` quotes in the same layout as `Jordi's Famous quotes.txt`.
+
+    Title and contributor lines, a year header, a few undated quotes, then
+    `Mon D - K` day headers each followed by K quotes. Blocks are plain
+    quotes (some with a trailing remark), `S: ` exchanges and `[...]` stage
+    directions. Days advance through the calendar, so a new year header comes
+    every few thousand quotes.
+    """
+    import random
+    from datetime import date, timedelta
+    from quote import _months
+
+    rng = random.Random(seed)
+    words = ("interesting", "looking", "good", "radians", "calculator", "babies",
+             "think", "about", "it", "convincing", "degrees", "cave", "people",
+             "function", "continuous", "interval", "solution", "answer", "box")
+    remarks = ("(instead of radians)", "(shows boxing posture)", "(sighs)", "(points at the board)")
+
+    def sentence() -> str:
+        return " ".join(rng.choice(words) for _ in range(rng.randint(3, 14))).capitalize()
+
+    def block() -> str:
+        kind = rng.random()
+        if kind < 0.12:
+            return f'S: "{sentence()}?"\n"{sentence()}!"'
+        if kind < 0.16:
+            return f'[{sentence()}]\n"{sentence()}"'
+        if kind < 0.22:
+            return f'"{sentence()}" {rng.choice(remarks)}'
+        return f'"{sentence()}"'
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("Mr. Jordi's Famous Quotes\n"
+                "Contributors: Synthetic Corpus\n"
+                "'S' stands for 'student'\n\n")
+        day = date(2022, 9, 1)
+        year = day.year
+        f.write(f"{year}\n\n")
+        written = min(n, 3)
+        for _ in range(written):
+            f.write(block() + "\n\n")
+        while written < n:
+            day += timedelta(days=rng.randint(1, 3))
+            if day.year != year:
+                year = day.year
+                f.write(f"{year}\n\n")
+            k = min(rng.randint(1, 20), n - written)
+            f.write(f"{_months[day.month - 1]} {day.day} - {k}\n\n")
+            for _ in range(k):
+                f.write(block() + "\n\n")
+            written += k
+
+
+def bench_extract(n: int = 100_000) -> dict:
+    """Time and peak traced memory of extract() vs streaming iter_extract()."""
+    import tracemalloc
+    import quote
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "corpus.txt")
+        write_synthetic_corpus(path, n)
+        size_mb = os.path.getsize(path) / 1e6
+        results = {"n": n, "file_mb": size_mb}
+        for name, fn in (("extract", lambda: quote.extract(path)),
+                         ("iter_extract", lambda: sum(1 for _ in quote.iter_extract(path)))):
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - t0
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            results[name] = {"s": elapsed, "peak_mb": peak / 1e6}
+            print(f"{name:<14} {n} quotes ({size_mb:.1f} MB): {elapsed:7.3f} s, peak {peak / 1e6:8.2f} MB")
+    return results
+
+
+def _synthetic_quotes(n: int, seed: int = 0):
+    """Yield `n` in-memory _quote objects with realistic sizes and dates."""
+    import random
+    from quote import _quote
+
+    rng = random.Random(seed)
+    words = ("interesting", "looking", "good", "radians", "calculator", "babies",
+             "think", "about", "it", "convincing", "degrees", "cave", "people")
+    for i in range(n):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(3, 14)))
+        date = (2022 + i * 4 // n, rng.choice((None, rng.randint(1, 12))), rng.randint(1, 28))
+        yield _quote._make(f'"{text.capitalize()}"', date, "Jordi A. Navarrette", i)
+
+
+def bench_memory(n: int = 1_000_000) -> dict:
+    """Traced memory of a list of _quote objects vs a columnar QuoteStore."""
+    import gc
+    import tracemalloc
+    from quote import QuoteStore
+
+    results = {"n": n}
+    for name, build in (("list[_quote]", lambda: list(_synthetic_quotes(n))),
+                        ("QuoteStore", lambda: QuoteStore(_synthetic_quotes(n)))):
+        gc.collect()
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        quotes = build()
+        elapsed = time.perf_counter() - t0
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        results[name] = {"build_s": elapsed, "mb": current / 1e6}
+        print(f"{name:<14} {n} quotes: {current / 1e6:8.1f} MB retained, built in {elapsed:6.2f} s")
+        del quotes
+    return results
+
+
+def bench_snapshot(n: int = 200_000) -> dict:
+    """Time to fetch one quote: mmap snapshot vs parsing all of quotes.json."""
+    from quote import MappedQuoteStore, QuoteStore, encode_quotes_to_json, load_quotes_from_json, write_snapshot
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "quotes.json")
+        snap_path = os.path.join(tmp, "quotes.snapshot")
+        store = QuoteStore(_synthetic_quotes(n))
+        encode_quotes_to_json(json_path, store)
+        write_snapshot(snap_path, store)
+
+        def via_json():
+            load_quotes_from_json(json_path)[n // 2].content
+
+        def via_snapshot():
+            mapped = MappedQuoteStore(snap_path)
+            mapped[n // 2].content
+            mapped.close()
+
+        results = {"n": n, "json_s": _timeit(via_json, 3), "snapshot_s": _timeit(via_snapshot, 20)}
+    print(f"one quote via quotes.json ({n} quotes): {results['json_s'] * 1000:10.3f} ms")
+    print(f"one quote via snapshot    ({n} quotes): {results['snapshot_s'] * 1000:10.3f} ms")
+    return results
+
+
+def bench_ids(n: int = 1_000_000, lookups: int = 100_000, changed: int = 1_000) -> dict:
+    """Stable ids: hashing cost, lookup by id in memory and through the snapshot, manifest diff."""
+    import random
+    from quote import MappedQuoteStore, QuoteStore, diff_manifest, manifest, write_snapshot
+
+    quotes = list(_synthetic_quotes(n))
+    t0 = time.perf_counter()
+    positional = QuoteStore()
+    for q in quotes:
+        positional.add(q.content, q.date, q.origin, q.id)
+    positional_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    store = QuoteStore()
+    for q in quotes:
+        store.add(q.content, q.date, q.origin)
+    hashed_s = time.perf_counter() - t0
+    del quotes, positional
+
+    store._id_table = None
+    t0 = time.perf_counter()
+    store._table()
+    table_s = time.perf_counter() - t0
+    ids = random.Random(0).sample(list(store.ids()), lookups)
+    find = store.find
+    t0 = time.perf_counter()
+    for i in ids:
+        find(i)
+    find_s = (time.perf_counter() - t0) / lookups
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snap_path = os.path.join(tmp, "quotes.snapshot")
+        write_snapshot(snap_path, store)
+
+        def open_and_get():
+            mapped = MappedQuoteStore(snap_path)
+            mapped.get(ids[0]).content
+            mapped.close()
+
+        open_get_s = _timeit(open_and_get, 20)
+        mapped = MappedQuoteStore(snap_path)
+        t0 = time.perf_counter()
+        for i in ids:
+            mapped.find(i)
+        mapped_find_s = (time.perf_counter() - t0) / lookups
+        mapped.close()
+
+    old = manifest(store)
+    new = old[changed:] + [-i for i in range(1, changed + 1)]
+    t0 = time.perf_counter()
+    added, removed = diff_manifest(old, new)
+    diff_s = time.perf_counter() - t0
+    assert len(added) == len(removed) == changed
+
+    results = {"n": n, "positional_s": positional_s, "hashed_s": hashed_s, "table_s": table_s,
+               "find_s": find_s, "snapshot_open_get_s": open_get_s, "snapshot_find_s": mapped_find_s,
+               "manifest_diff_s": diff_s}
+    print(f"fill store, given ids ({n} quotes):  {positional_s:9.2f} s")
+    print(f"fill store, stable ids ({n} quotes): {hashed_s:9.2f} s")
+    print(f"build id table:                    {table_s * 1000:9.1f} ms")
+    print(f"get(id) in memory:                 {find_s * 1e6:9.2f} us")
+    print(f"open snapshot + get(id):           {open_get_s * 1000:9.3f} ms")
+    print(f"get(id) in snapshot:               {mapped_find_s * 1e6:9.2f} us")
+    print(f"manifest diff ({changed} in, {changed} out):  {diff_s * 1000:9.1f} ms")
+    return results
+
+
+def bench_json(sizes: tuple[int, ...] = (10_000, 100_000, 1_000_000)) -> dict:
+    """Encode/decode throughput of the JSON and JSON Lines codecs."""
+    import json
+    from quote import (QuoteStore, _quote, encode_quotes_to_json, encode_quotes_to_jsonl,
+                       iter_quotes_from_jsonl, load_quotes_from_json)
+
+    def legacy_encode(path, quotes):
+        # The original per-row json.dumps + write loop, for comparison
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('{"quotes": [\n')
+            for i, q in enumerate(quotes):
+                f.write("\t" + q.encode() + ("," if i != len(quotes) - 1 else "") + "\n")
+            f.write("\n]}")
+
+    def legacy_decode(path):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return [_quote.decode(json.dumps(d)) for d in data["quotes"]]
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "quotes.json")
+        jsonl_path = os.path.join(tmp, "quotes.jsonl")
+        for n in sizes:
+            quotes = list(_synthetic_quotes(n))
+            row = results[n] = {}
+            for name, fn in (
+                ("encode_legacy", lambda: legacy_encode(json_path, quotes)),
+                ("encode_json", lambda: encode_quotes_to_json(json_path, quotes)),
+                ("encode_jsonl", lambda: encode_quotes_to_jsonl(jsonl_path, quotes)),
+                ("decode_legacy", lambda: legacy_decode(json_path)),
+                ("decode_json", lambda: load_quotes_from_json(json_path)),
+                ("decode_jsonl", lambda: sum(1 for _ in iter_quotes_from_jsonl(jsonl_path))),
+            ):
+                elapsed = _timeit(fn, 1 if n >= 1_000_000 else 3)
+                row[name] = n / elapsed
+                print(f"{name:<14} {n:>9} quotes: {n / elapsed:12,.0f} quotes/s")
+            del quotes
+    return results
+
+
+def bench_search(n: int = 1_000_000, queries: int = 200) -> dict:
+    """Index build time and query latency over a Zipf-distributed vocabulary."""
+    import random
+    from search import SearchIndex
+
+    rng = random.Random(1)
+    vocab = [f"w{i}" for i in range(50_000)]
+    cum_weights = list(itertools.accumulate(1 / (i + 1) for i in range(len(vocab))))
+    contents = []
+    index = SearchIndex()
+    t0 = time.perf_counter()
+    for _ in range(n):
+        text = " ".join(rng.choices(vocab, cum_weights=cum_weights, k=rng.randint(3, 14)))
+        contents.append(text)
+        index.add(text)
+    build_s = time.perf_counter() - t0
+
+    def latency(make_query):
+        qs = [make_query() for _ in range(queries)]
+        t0 = time.perf_counter()
+        for q in qs:
+            index.search(q, 10, contents)
+        return (time.perf_counter() - t0) / queries
+
+    results = {
+        "n": n,
+        "build_s": build_s,
+        "rare_term_ms": latency(lambda: f"w{rng.randint(5_000, 49_999)}") * 1000,
+        "two_terms_ms": latency(lambda: f"w{rng.randint(1_000, 49_999)} w{rng.randint(1_000, 49_999)}") * 1000,
+        "prefix_ms": latency(lambda: f"w{rng.randint(1_000, 9_999)}*") * 1000,
+        "phrase_ms": latency(lambda: f'"w{rng.randint(500, 5_000)} w{rng.randint(500, 5_000)}"') * 1000,
+        "common_term_ms": latency(lambda: f"w{rng.randint(0, 9)}") * 1000,
+    }
+    print(f"index build ({n} quotes): {build_s:.1f} s")
+    for key in ("rare_term_ms", "two_terms_ms", "prefix_ms", "phrase_ms", "common_term_ms"):
+        print(f"{key[:-3]:<12} query: {results[key]:9.3f} ms")
+    return results
+
+
+def bench_incremental(n: int = 100_000, appended: int = 1_000) -> dict:
+    """Full extraction vs extract_incremental after appending a few quotes."""
+    from quote import extract_incremental
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "corpus.txt")
+        tail = os.path.join(tmp, "tail.txt")
+        write_synthetic_corpus(path, n)
+        write_synthetic_corpus(tail, appended, seed=1)
+        t0 = time.perf_counter()
+        store, sections = extract_incremental(path)
+        full_s = time.perf_counter() - t0
+        with open(tail, "r", encoding="utf-8") as f:
+            extra = f.read().split("\n\n", 1)[1]
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("Dec 31\n\n" + extra)
+        t0 = time.perf_counter()
+        store, sections = extract_incremental(path, store, sections)
+        incremental_s = time.perf_counter() - t0
+    results = {"n": n, "appended": appended, "full_s": full_s, "incremental_s": incremental_s}
+    print(f"full extraction ({n} quotes):        {full_s * 1000:9.1f} ms")
+    print(f"after appending {appended} quotes: {incremental_s * 1000:9.1f} ms")
+    return results
+
+
+def bench_reload(n: int = 200_000, appended: int = 2) -> dict:
+    """load_corpus from scratch vs after appending a few quotes to the text.
+
+    Includes opening the snapshot and updating quotes.json, the snapshot and
+    the cache metadata.
+    """
+    from quote import load_corpus
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "corpus.txt")
+        files = (path, os.path.join(tmp, "quotes.json"), os.path.join(tmp, "cache.json"))
+        snapshot = os.path.join(tmp, "quotes.snapshot")
+        write_synthetic_corpus(path, n)
+        t0 = time.perf_counter()
+        load_corpus(*files, snapshot_path=snapshot)
+        full_s = time.perf_counter() - t0
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("".join(f'\n\n"appended quote {i}"' for i in range(appended)))
+        t0 = time.perf_counter()
+        quotes = load_corpus(*files, snapshot_path=snapshot)
+        append_s = time.perf_counter() - t0
+        assert len(quotes) == n + appended
+    results = {"n": n, "appended": appended, "full_s": full_s, "append_s": append_s}
+    print(f"load_corpus, no cache ({n} quotes): {full_s * 1000:9.1f} ms")
+    print(f"after appending {appended} quotes:      {append_s * 1000:9.1f} ms")
+    return results
+
+
+def bench_parallel(n: int = 400_000, max_workers: int = 8) -> dict:
+    """extract() vs extract_parallel() with 1, 2, 4, ... worker processes.
+
+    Chunks are split at year headers, which the synthetic corpus has every
+    few thousand quotes.
+    """
+    from quote import extract, extract_parallel
+
+    results = {"n": n, "cpus": os.cpu_count()}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "corpus.txt")
+        write_synthetic_corpus(path, n)
+        base = results["sequential_s"] = _timeit(lambda: extract(path), 1)
+        print(f"extract() sequential:       {base:7.2f} s")
+        workers = 1
+        while workers <= max_workers:
+            elapsed = _timeit(lambda: extract_parallel(path, workers=workers), 1)
+            results[f"workers_{workers}_s"] = elapsed
+            print(f"extract_parallel({workers} workers): {elapsed:7.2f} s  ({base / elapsed:4.1f}x)")
+            workers *= 2
+    return results
+
+
+def bench_render(n: int = 100_000) -> dict:
+    """str() on every quote vs RenderCache columns (cold build, then warm)."""
+    from quote import QuoteStore
+    from render import RenderCache
+
+    store = QuoteStore(_synthetic_quotes(n))
+    quotes = list(store)
+    cache = RenderCache(store)
+    results = {
+        "n": n,
+        "str_s": _timeit(lambda: [str(q) for q in quotes], 3),
+        "render_all_cold_s": _timeit(lambda: (cache.invalidate(), cache.render_all("notification")), 1),
+        "render_all_warm_s": _timeit(lambda: cache.render_all("notification"), 3),
+        "get_warm_s": _timeit(lambda: [cache.get(i, "notification") for i in range(n)], 3),
+    }
+    for key in ("str_s", "render_all_cold_s", "render_all_warm_s", "get_warm_s"):
+        print(f"{key[:-2]:<18} {n} quotes: {results[key] * 1000:9.2f} ms")
+    return results
+
+
+def bench_sample(n: int = 200_000, draws: int = 100_000) -> dict:
+    """Filtered/weighted draws: filter + random.choice vs the Sampler's facets and alias tables."""
+    import random
+    from quote import QuoteStore
+    from sampler import Sampler
+
+    store = QuoteStore(_synthetic_quotes(n))
+    year = store[n // 2].date[0]
+    results = {"n": n, "draws": draws}
+    t0 = time.perf_counter()
+    sampler = Sampler(store, window=20, rng=random.Random(0))
+    results["build_s"] = time.perf_counter() - t0
+    quotes = list(store)
+    rng = random.Random(0)
+    results["filter_choice_s"] = _timeit(
+        lambda: [rng.choice([q for q in quotes if q.date[0] == year]) for _ in range(10)], 1) * draws / 10
+    for label, kwargs in (("uniform", {}), ("year", {"year": year}),
+                          ("weighted", {"weighted": True}), ("year_weighted", {"year": year, "weighted": True})):
+        sampler.sample(**kwargs)  # build the pool and alias table outside the timing
+        results[f"{label}_s"] = _timeit(lambda: [sampler.sample(**kwargs) for _ in range(draws)], 3)
+    print(f"{'build':<16} {n} quotes: {results['build_s'] * 1000:9.2f} ms")
+    for key, value in results.items():
+        if key.endswith("_s") and key != "build_s":
+            print(f"{key[:-2]:<16} {draws} draws: {value * 1000:9.2f} ms")
+    return results
+
+
+def bench_dedup(n: int = 1_000_000, dup_rate: float = 0.01) -> dict:
+    """MinHash/LSH near-duplicate clustering vs the all-pairs estimate.
+
+    The corpus draws from a few thousand made-up words, and a fraction of
+    quotes are copies of earlier ones with one word changed or added.
+    """
+    import random
+    import dedup
+    from quote import _quote
+
+    rng = random.Random(0)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocab = ["".join(rng.choice(letters) for _ in range(rng.randint(2, 9))) for _ in range(5000)]
+    texts: list[str] = []
+    planted = 0
+    for i in range(n):
+        if texts and rng.random() < dup_rate:
+            words = rng.choice(texts).split()
+            words.insert(rng.randrange(len(words) + 1), rng.choice(vocab))
+            planted += 1
+        else:
+            words = [rng.choice(vocab) for _ in range(rng.randint(4, 16))]
+        texts.append(" ".join(words))
+    quotes = [_quote._make(f'"{t}"', (2025, None, None), "Jordi A. Navarrette", i) for i, t in enumerate(texts)]
+    del texts
+
+    t0 = time.perf_counter()
+    clusters = dedup.find_duplicates(quotes)
+    lsh_s = time.perf_counter() - t0
+    # All pairs: time a sample of exact comparisons and scale up
+    sample = [dedup.shingles(q.content) for q in quotes[:300]]
+    t0 = time.perf_counter()
+    for a in sample:
+        for b in sample:
+            len(a & b) >= 0.6 * len(a | b)
+    per_pair = (time.perf_counter() - t0) / len(sample) ** 2
+    pairs_s = per_pair * n * (n - 1) / 2
+    found = sum(len(c) - 1 for c in clusters)
+    results = {"n": n, "planted": planted, "clusters": len(clusters), "redundant": found,
+               "lsh_s": lsh_s, "all_pairs_estimate_s": pairs_s}
+    print(f"LSH clustering, {n} quotes:   {lsh_s:9.2f} s  ({len(clusters)} clusters, "
+          f"{found} of {planted} planted duplicates)")
+    print(f"all pairs (estimated):        {pairs_s:9.0f} s  (~{pairs_s / 86400:.1f} days)")
+    return results
+
+
+def bench_analytics(n: int = 1_000_000) -> dict:
+    """CorpusStats setup once, then each query (target: well under 100 ms at 1M quotes)."""
+    from quote import QuoteStore
+    from analytics import CorpusStats
+    from search import SearchIndex
+
+    store = QuoteStore(_synthetic_quotes(n))
+    index = SearchIndex()
+    index.extend(store)
+    t0 = time.perf_counter()
+    corpus = CorpusStats(store, index)
+    results = {"n": n, "build_s": time.perf_counter() - t0}
+    t0 = time.perf_counter()
+    corpus.top_terms(1)
+    results["postings_s"] = time.perf_counter() - t0
+    year = int(corpus.years[n // 2])
+    for label, fn in (("per_month", lambda: corpus.per_month()),
+                      ("per_month_year", lambda: corpus.per_month(year)),
+                      ("growth", lambda: corpus.growth()),
+                      ("lengths", lambda: corpus.length_stats()),
+                      ("top_terms", lambda: corpus.top_terms(20)),
+                      ("top_terms_student", lambda: corpus.top_terms(20, year, "student"))):
+        results[f"{label}_s"] = _timeit(fn, 3)
+    for key, value in results.items():
+        if key.endswith("_s"):
+            print(f"{key[:-2]:<18} {n} quotes: {value * 1000:9.2f} ms")
+    return results
+
+
+def bench_state(subscribers: int = 100_000) -> dict:
+    """One scheduled run: read and update the state of every subscriber."""
+    from state import SQLiteStateBackend
+
+    results = {"subscribers": subscribers}
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = SQLiteStateBackend(os.path.join(tmp, "state.db"), batch_size=5000)
+        names = [f"user{i}" for i in range(subscribers)]
+        for label, day in (("first_run_s", "2025-11-17"), ("next_run_s", "2025-11-18")):
+            t0 = time.perf_counter()
+            for name in names:
+                state = backend.get(name) or {}
+                backend.set(name, {"last_date": day, "last_quote_id": state.get("last_quote_id", 0) + 1})
+            backend.flush()
+            results[label] = time.perf_counter() - t0
+        backend.close()
+        reopened = SQLiteStateBackend(os.path.join(tmp, "state.db"))
+        t0 = time.perf_counter()
+        reopened.get_many(names)
+        results["cold_read_s"] = time.perf_counter() - t0
+        reopened.close()
+    for key in ("first_run_s", "next_run_s", "cold_read_s"):
+        print(f"{key[:-2]:<10} {subscribers} subscribers: {results[key]:7.2f} s")
+    return results
+
+
+def bench_notify(n: int = 5_000, latency: float = 0.005) -> dict:
+    """Headless dispatch throughput through FakeBackend for several pool sizes."""
+    from notify import Dispatcher, FakeBackend
+
+    results = {"n": n, "latency_s": latency}
+    for workers in (1, 4, 16):
+        d = Dispatcher([FakeBackend(latency=latency, fail_every=100)], workers=workers, backoff=0.001)
+        t0 = time.perf_counter()
+        for _ in range(n):
+            d.submit("📖 Daily Quote", "message", "origin")
+        d.join()
+        elapsed = time.perf_counter() - t0
+        results[f"workers_{workers}_per_s"] = n / elapsed
+        print(f"{workers:>2} workers: {n / elapsed:10,.0f} notifications/s, "
+              f"mean latency {d.latency_total / max(d.metrics['delivered'], 1) * 1000:8.1f} ms, "
+              f"retries {d.metrics['retries']}")
+    return results
+
+
+async def _load_client(host: str, port: int, paths: list[str], deadline: float, counts: list[int]) -> None:
+    import asyncio
+
+    reader, writer = await asyncio.open_connection(host, port)
+    i = 0
+    try:
+        while time.perf_counter() < deadline:
+            path = paths[i % len(paths)]
+            i += 1
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            if length:
+                await reader.readexactly(length)
+            counts[0] += 1
+    finally:
+        writer.close()
+
+
+def bench_server(duration: float = 5.0, connections: int = 50, host: str = "127.0.0.1",
+                 port: int | None = None) -> dict:
+    """Load test the HTTP service over keep-alive connections.
+
+    Starts `server.py` on a free port unless `port` points at a running one.
+    Quotes are requested by ids taken from the server's /manifest.
+    """
+    import asyncio
+    import json
+    import socket
+    import urllib.request
+
+    proc = None
+    if port is None:
+        with socket.socket() as sock:
+            sock.bind((host, 0))
+            port = sock.getsockname()[1]
+        proc = subprocess.Popen([sys.executable, os.path.join(_here, "server.py"), "--host", host,
+                                 "--port", str(port)], cwd=_here, stdout=subprocess.DEVNULL)
+        for _ in range(100):
+            try:
+                socket.create_connection((host, port), timeout=0.1).close()
+                break
+            except OSError:
+                time.sleep(0.1)
+    results = {"connections": connections, "duration_s": duration}
+    try:
+        with urllib.request.urlopen(f"http://{host}:{port}/manifest", timeout=30) as response:
+            ids = json.load(response)["ids"]
+        first, other = f"/quote/{ids[3 % len(ids)]}", f"/quote/{ids[100 % len(ids)]}"
+        paths = [first, "/daily", "/random", other, "/search?q=radians", "/range?start=2024-12"]
+        for label, mix in (("quote", [first]), ("mixed", paths)):
+            counts = [0]
+
+            async def run():
+                deadline = time.perf_counter() + duration
+                await asyncio.gather(*(_load_client(host, port, mix, deadline, counts)
+                                       for _ in range(connections)))
+
+            asyncio.run(run())
+            results[f"{label}_rps"] = counts[0] / duration
+            print(f"{label:<6} {connections} connections: {counts[0] / duration:10,.0f} requests/s")
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+    return results
+
+
+def bench_hotpaths(sizes: tuple[int, ...] = (1_000, 10_000, 100_000, 1_000_000)) -> dict:
+    """The per-quote hot paths at several corpus sizes.
+
+    extract(), encode_quotes_to_json, load_quotes_from_json, str() on every
+    quote, and daily/random selection (one lookup each, after setup).
+    """
+    import random
+    from datetime import date, timedelta
+    import quote
+    from dailycalendar import QuoteCalendar
+    from sampler import Sampler
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            path = os.path.join(tmp, "corpus.txt")
+            json_path = os.path.join(tmp, "quotes.json")
+            write_synthetic_corpus(path, n)
+            repeat = 3 if n <= 100_000 else 1
+            quotes = quote.extract(path)
+            days = [date(2025, 1, 1) + timedelta(days=d) for d in range(365)]
+            calendar = QuoteCalendar(None)
+            sampler = Sampler(quotes, window=20, rng=random.Random(0))
+            store = quote.QuoteStore(quotes)
+            calendar.index_for(days[0], store)
+            row = {
+                "extract_s": _timeit(lambda: quote.extract(path), repeat),
+                "encode_json_s": _timeit(lambda: quote.encode_quotes_to_json(json_path, quotes), repeat),
+                "load_json_s": _timeit(lambda: quote.load_quotes_from_json(json_path), repeat),
+                "str_s": _timeit(lambda: [str(q) for q in quotes], repeat),
+                "daily_s": _timeit(lambda: [calendar.index_for(d, store) for d in days], repeat) / len(days),
+                "random_s": _timeit(lambda: [sampler.sample() for _ in range(1000)], repeat) / 1000,
+            }
+            results[str(n)] = row
+            print(f"-- {n} quotes --")
+            for key, value in row.items():
+                unit, scale = ("us", 1e6) if key in ("daily_s", "random_s") else ("ms", 1e3)
+                print(f"{key[:-2]:<12} {value * scale:10.2f} {unit}")
+    return results
+
+
+BENCHMARKS = {
+    "import": bench_import,
+    "startup": bench_startup,
+    "extract": bench_extract,
+    "memory": bench_memory,
+    "snapshot": bench_snapshot,
+    "ids": bench_ids,
+    "json": bench_json,
+    "search": bench_search,
+    "incremental": bench_incremental,
+    "reload": bench_reload,
+    "parallel": bench_parallel,
+    "render": bench_render,
+    "sample": bench_sample,
+    "dedup": bench_dedup,
+    "analytics": bench_analytics,
+    "state": bench_state,
+    "notify": bench_notify,
+    "server": bench_server,
+    "hotpaths": bench_hotpaths,
+}
+
+
+def _timings(results: dict, prefix: str = "") -> dict[str, float]:
+    """Flatten nested results to {"bench.key.sub_s": seconds}"""
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, dict):
+            flat.update(_timings(value, name))
+        elif isinstance(value, (int, float)) and (key == "s" or str(key).endswith("_s")):
+            flat[name] = value
+    return flat
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.10) -> list[str]:
+    """Timings in `current` more than `threshold` slower than in `baseline`"""
+    old = _timings(baseline["results"])
+    new = _timings(current["results"])
+    regressions = []
+    for name in sorted(old.keys() & new.keys()):
+        if old[name] > 0 and new[name] > old[name] * (1 + threshold):
+            regressions.append(f"{name}: {old[name] * 1000:.3f} ms -> {new[name] * 1000:.3f} ms "
+                               f"(+{(new[name] / old[name] - 1) * 100:.0f}%)")
+    return regressions
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], cwd=_here, capture_output=True, text=True)
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def main(argv: list[str]) -> int:
+    import argparse
+    import json
+    import platform
+
+    parser = argparse.ArgumentParser(description="Run quote benchmarks.")
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run (default: all): {', '.join(BENCHMARKS)}")
+    parser.add_argument("--sizes", help="comma-separated corpus sizes for hotpaths, e.g. 1000,10000")
+    parser.add_argument("--corpus", nargs=2, metavar=("N", "PATH"),
+                        help="only write a synthetic corpus of N quotes to PATH")
+    parser.add_argument("--out", help="save results as JSON to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="report timings slower than a saved results file")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown counted as a regression (default: 0.10)")
+    args = parser.parse_args(argv)
+
+    if args.corpus:
+        write_synthetic_corpus(args.corpus[1], int(args.corpus[0]))
+        return 0
+
+    results = {}
+    for name in args.names or list(BENCHMARKS):
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark '{name}'. Choose from: {', '.join(BENCHMARKS)}")
+            continue
+        print(f"== {name} ==")
+        if name == "hotpaths" and args.sizes:
+            results[name] = bench_hotpaths(tuple(int(n) for n in args.sizes.split(",")))
+        else:
+            results[name] = BENCHMARKS[name]()
+
+    report = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results saved to {args.out}")
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.threshold)
+        print(f"Compared with {args.compare} ({baseline.get('commit') or 'unknown commit'}): "
+              f"{len(regressions)} regression(s)")
+        for line in regressions:
+            print(f"  {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,257 @@
+"""Several quote collections side by side.
+
+The registry knows Jordi's quotes (the default corpus, shared with quote.py)
+plus every `corpora/*.txt` file, written in the same format. A file can name
+its speaker and language in its first block:
+
+    Ms. Smith's Famous Quotes
+    Origin: Jane Smith
+    Language: en
+
+Discovery only reads that first block. A corpus is loaded the first time a
+query needs it, through quote.load_corpus with its own cache, snapshot and
+search index under `corpora/.cache/`, so each one starts as fast as the
+default corpus does and queries limited to some corpora (by name or
+language) never load the others. Origins are interned by QuoteStore and
+index terms by SearchIndex, so corpora loaded together share those strings.
+
+>>> from corpora import get_registry
+>>> reg = get_registry()
+>>> reg.daily()
+>>> reg.search("radians", languages=["en"])
+"""
+from datetime import date
+import heapq
+import os
+import random
+
+import quote
+from quote import _quote
+from dailycalendar import QuoteCalendar, get_calendar
+
+_corpora_dir = os.path.join(quote._here, "corpora")
+DEFAULT = "jordi"
+
+
+class Corpus:
+    def __init__(self, name: str, source: str, origin: str = quote._origin, language: str = "en",
+                 cache_dir: str | None = None):
+        self.name = name
+        self.source = source
+        self.origin = origin
+        self.language = language
+        self.cache_dir = cache_dir
+        self._quotes = None
+        self._index = None
+        self._calendar: QuoteCalendar | None = None
+
+    def __repr__(self) -> str:
+        state = f"{len(self._quotes)} quotes" if self._quotes is not None else "not loaded"
+        return f"Corpus({self.name!r}, {self.language}, {state})"
+
+    def _path(self, suffix: str) -> str:
+        return os.path.join(self.cache_dir, self.name + suffix)
+
+    @property
+    def loaded(self) -> bool:
+        return self._quotes is not None
+
+    @property
+    def quotes(self):
+        if self._quotes is None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._quotes = quote.load_corpus(self.source, self._path(".json"), self._path(".meta.json"),
+                                             snapshot_path=self._path(".snapshot"), origin=self.origin)
+        return self._quotes
+
+    def reload(self) -> None:
+        """Drop the loaded quotes and index; the next query loads them again"""
+        self._quotes = None
+        self._index = None
+
+    @property
+    def index(self):
+        if self._index is None:
+            import search
+            self._index = search.load_or_build(self.quotes, self._path(".index"), self._path(".meta.json"))
+        return self._index
+
+    @property
+    def calendar(self) -> QuoteCalendar:
+        if self._calendar is None:
+            self._calendar = QuoteCalendar(self._path(".calendar.json"))
+        return self._calendar
+
+    def size_hint(self) -> int:
+        """Number of quotes, read from the cache metadata if the corpus is not loaded"""
+        if self._quotes is None:
+            count = quote._read_cache_meta(self._path(".meta.json")).get('count')
+            if count is not None:
+                return count
+        return len(self.quotes)
+
+
+class _DefaultCorpus(Corpus):
+    """Jordi's quotes, through quote.py's module-level list, cache and index"""
+
+    def __init__(self):
+        super().__init__(DEFAULT, quote._source_file)
+
+    @property
+    def quotes(self):
+        return quote.get_quote_list()
+
+    @property
+    def loaded(self) -> bool:
+        return quote._quote_list is not None
+
+    def reload(self) -> None:
+        quote.reload_quote_list()
+
+    @property
+    def index(self):
+        import search
+        return search.get_index()
+
+    @property
+    def calendar(self) -> QuoteCalendar:
+        return get_calendar()
+
+    def size_hint(self) -> int:
+        if not self.loaded:
+            count = quote._read_cache_meta(quote._cache_file).get('count')
+            if count is not None:
+                return count
+        return len(self.quotes)
+
+
+def _read_header(path: str) -> dict[str, str]:
+    """`Key: value` lines from the first block of a quote file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        head = f.read(4096).split("\n\n", 1)[0]
+    fields = {}
+    for line in head.splitlines():
+        key, sep, value = line.partition(":")
+        if sep and key.strip().isalpha():
+            fields[key.strip().lower()] = value.strip()
+    return fields
+
+
+class CorpusRegistry:
+    def __init__(self, corpora_dir: str = _corpora_dir, include_default: bool = True):
+        self.corpora_dir = corpora_dir
+        self.corpora: dict[str, Corpus] = {}
+        if include_default:
+            self.corpora[DEFAULT] = _DefaultCorpus()
+        self.discover()
+
+    def discover(self) -> list[str]:
+        """Register every not yet known .txt file in corpora_dir; returns the new names"""
+        try:
+            files = sorted(f for f in os.listdir(self.corpora_dir) if f.endswith(".txt"))
+        except OSError:
+            return []
+        added = []
+        for file_name in files:
+            name = file_name[:-4]
+            if name in self.corpora:
+                continue
+            path = os.path.join(self.corpora_dir, file_name)
+            try:
+                header = _read_header(path)
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"Skipping corpus '{path}': {e}")
+                continue
+            self.corpora[name] = Corpus(name, path, header.get("origin", name),
+                                        header.get("language", "en"),
+                                        os.path.join(self.corpora_dir, ".cache"))
+            added.append(name)
+        return added
+
+    def add(self, corpus: Corpus) -> None:
+        self.corpora[corpus.name] = corpus
+
+    def __len__(self) -> int:
+        return len(self.corpora)
+
+    def __iter__(self):
+        return iter(self.corpora.values())
+
+    def __getitem__(self, name: str) -> Corpus:
+        return self.corpora[name]
+
+    def names(self) -> list[str]:
+        return list(self.corpora)
+
+    def select(self, names: list[str] | None = None, languages: list[str] | None = None) -> list[Corpus]:
+        """Corpora matching the filters, without loading any of them"""
+        if names is not None:
+            unknown = [n for n in names if n not in self.corpora]
+            if unknown:
+                raise KeyError(f"unknown corpus: {', '.join(unknown)}")
+            chosen = [self.corpora[n] for n in names]
+        else:
+            chosen = list(self.corpora.values())
+        if languages is not None:
+            chosen = [c for c in chosen if c.language in languages]
+        return chosen
+
+    def daily(self, day: date | None = None, names: list[str] | None = None,
+              languages: list[str] | None = None) -> tuple[str, _quote]:
+        """(corpus name, quote) of the day across the selected corpora.
+
+        The corpus is picked from the day alone, then that corpus's own
+        calendar picks the quote, so only one corpus is loaded.
+        """
+        day = day or date.today()
+        chosen = self.select(names, languages)
+        if not chosen:
+            raise LookupError("no corpus matches")
+        corpus = chosen[random.Random(f"corpus:{day.toordinal()}").randrange(len(chosen))]
+        quotes = corpus.quotes
+        return corpus.name, quotes[corpus.calendar.index_for(day, quotes)]
+
+    def random(self, names: list[str] | None = None, languages: list[str] | None = None,
+               rng: random.Random | None = None) -> tuple[str, _quote]:
+        """(corpus name, quote) drawn uniformly over all quotes of the selected corpora.
+
+        Corpus sizes come from cache metadata where possible, so only the
+        corpus the quote is drawn from has to be loaded.
+        """
+        rng = rng or random
+        chosen = self.select(names, languages)
+        sizes = [c.size_hint() for c in chosen]
+        if not chosen or not sum(sizes):
+            raise LookupError("no quotes in the selected corpora")
+        corpus = rng.choices(chosen, weights=sizes)[0]
+        quotes = corpus.quotes
+        return corpus.name, quotes[rng.randrange(len(quotes))]
+
+    def search(self, query: str, limit: int = 10, names: list[str] | None = None,
+               languages: list[str] | None = None) -> list[tuple[str, _quote]]:
+        """Best matches for `query` in the selected corpora, as (corpus name, quote)
+
+        Every corpus is scored with statistics over all the selected ones, so
+        a hit in a small corpus does not outrank a better one in a large
+        corpus just because its own index is smaller.
+        """
+        import search
+        chosen = self.select(names, languages)
+        collection = search.CollectionStats(corpus.index for corpus in chosen)
+        hits = []
+        for corpus in chosen:
+            quotes = corpus.quotes
+            for score, doc in corpus.index.search(query, limit, search._Contents(quotes), collection):
+                hits.append((score, corpus.name, doc))
+        best = heapq.nlargest(limit, hits, key=lambda h: h[0])
+        return [(name, self.corpora[name].quotes[doc]) for _, name, doc in best]
+
+
+_registry: CorpusRegistry | None = None
+
+
+def get_registry() -> CorpusRegistry:
+    global _registry
+    if _registry is None:
+        _registry = CorpusRegistry()
+    return _registry
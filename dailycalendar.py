@@ -0,0 +1,158 @@
+"""Deterministic daily quote calendar.
+
+Days are counted from a fixed epoch and grouped into cycles. A cycle's
+members are the quotes in the corpus when it began, and it walks through a
+seeded shuffle of their ids, one quote per day, so every quote comes up
+exactly once per cycle and no quote repeats on consecutive days within one.
+Quotes added during a cycle join at the next one, wherever they were
+inserted in the file; cycles that have started are never reshuffled, so
+past days keep their quote. A member deleted since is replaced by the next
+one in the cycle's order that still exists.
+
+The cycle table (start day and shuffled member ids of each cycle) is saved
+so every process, service and subscriber using the same file and seed
+agrees on "today's quote". Looking up a day is a binary search over the few
+cycles, an array index and one id lookup, and never touches the global
+random module.
+"""
+from array import array
+from bisect import bisect_right
+from datetime import date
+import json
+import os
+import random
+import threading
+
+import quote
+
+_calendar_file = os.path.join(quote._here, "quote_calendar.json")
+EPOCH = date(2022, 1, 1)
+DEFAULT_SEED = 67
+
+
+def _find(quotes, id: int) -> int:
+    """Position of the quote with this id, or -1"""
+    find = getattr(quotes, "find", None)
+    if find is not None:
+        return find(id)
+    return next((i for i, q in enumerate(quotes) if q.id == id), -1)
+
+
+class QuoteCalendar:
+    def __init__(self, file_path: str | None = _calendar_file, seed: int = DEFAULT_SEED,
+                 epoch: date = EPOCH):
+        self.file_path = file_path
+        self.seed = seed
+        self.epoch = epoch
+        self.starts: list[int] = []
+        self.sizes: list[int] = []
+        # Member ids of each recorded cycle in the order they come up; None for
+        # cycles saved by older versions, which only recorded a size
+        self.orders: list[array | None] = []
+        self._future: tuple | None = None
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if self.file_path is None:
+            return
+        try:
+            with open(self.file_path, 'r') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if data.get('seed') != self.seed or data.get('epoch') != self.epoch.isoformat():
+            return
+        for start, members in data.get('cycles', []):
+            self.starts.append(start)
+            if isinstance(members, int):
+                self.sizes.append(members)
+                self.orders.append(None)
+            else:
+                self.sizes.append(len(members))
+                self.orders.append(array('q', members))
+
+    def _save(self) -> None:
+        if self.file_path is None:
+            return
+        tmp_path = self.file_path + ".tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({'seed': self.seed, 'epoch': self.epoch.isoformat(),
+                           'cycles': [[start, order.tolist() if order is not None else size]
+                                      for start, size, order in zip(self.starts, self.sizes, self.orders)]}, f)
+            os.replace(tmp_path, self.file_path)
+        except OSError as e:
+            print(f"Error saving quote calendar '{self.file_path}': {e}")
+
+    def _shuffle(self, cycle: int, quotes) -> array:
+        """The ids of `quotes` in the order cycle `cycle` shows them"""
+        # Sorted first, so the order depends on which quotes there are, not on where they sit
+        order = sorted(quote.manifest(quotes))
+        random.Random(f"{self.seed}:{cycle}").shuffle(order)
+        return array('q', order)
+
+    def _order(self, cycle: int, quotes) -> array:
+        order = self.orders[cycle]
+        if order is None:
+            # Saved by a version that kept positions: pin the quotes those positions hold now
+            positions = list(range(self.sizes[cycle]))
+            random.Random(f"{self.seed}:{cycle}").shuffle(positions)
+            ids = quote.manifest(quotes)
+            order = self.orders[cycle] = array('q', (ids[p % len(ids)] for p in positions))
+            self._save()
+        return order
+
+    def _cycle_for(self, day: int, quotes, persist: bool) -> tuple[int, array]:
+        """(start day, member order) of the cycle containing `day`"""
+        if self.starts and day < self.starts[-1] + self.sizes[-1]:
+            k = bisect_right(self.starts, day) - 1
+            return self.starts[k], self._order(k, quotes)
+        # Past the last recorded cycle: later cycles are made of the current quotes
+        n = len(quotes)
+        k = len(self.starts)
+        start = self.starts[-1] + self.sizes[-1] if self.starts else 0
+        if day >= start + n:
+            skip = (day - start) // n
+            k += skip
+            start += skip * n
+        if persist:
+            # Record the cycles in between too, so they never change later
+            while len(self.starts) <= k:
+                self.starts.append(self.starts[-1] + self.sizes[-1] if self.starts else 0)
+                self.sizes.append(n)
+                self.orders.append(self._shuffle(len(self.orders), quotes))
+            self._save()
+            return start, self.orders[k]
+        key = (k, id(quotes), n, getattr(quotes, "version", 0))
+        if self._future is None or self._future[0] != key:
+            self._future = (key, self._shuffle(k, quotes))
+        return start, self._future[1]
+
+    def index_for(self, day: date, quotes) -> int:
+        """Position in `quotes` of the quote for `day`"""
+        if not len(quotes):
+            raise ValueError("no quotes to choose from")
+        offset = (day - self.epoch).days
+        with self._lock:
+            start, order = self._cycle_for(max(offset, 0), quotes, persist=day <= date.today())
+        if offset < start:
+            # Days before the epoch repeat the first cycle backwards
+            offset %= len(order)
+        i = offset - start
+        for j in range(len(order)):
+            index = _find(quotes, order[(i + j) % len(order)])
+            if index >= 0:
+                return index
+        # Every member of the cycle has been deleted
+        return offset % len(quotes)
+
+
+_calendar: QuoteCalendar | None = None
+
+
+def get_calendar() -> QuoteCalendar:
+    global _calendar
+    if _calendar is None:
+        _calendar = QuoteCalendar()
+    return _calendar
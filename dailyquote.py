@@ -1,238 +1,274 @@
-import random
-import time
-import schedule
-import threading
-from datetime import datetime, date
-from typing import List
-import json
-import os
+"""Daily quote notifications and command line.
+
+    python dailyquote.py today [--notify]
+    python dailyquote.py random [--year 2025] [--speaker student|teacher] [--weighted]
+    python dailyquote.py show ID
+    python dailyquote.py search WORDS... [--limit 10]
+    python dailyquote.py serve [--host 127.0.0.1] [--port 8067]
+    python dailyquote.py daemon [--at 07:59] [--updates]
+    python dailyquote.py            # interactive menu
+
+Before the command, --state-db FILE [--subscriber NAME] keeps the daily
+state in a SQLite database (see state.py) instead of quote_data.json.
+
+Commands read the prebuilt cache (see quote.load_corpus) and import only what
+they use, so `today` is cheap enough for cron or a shell prompt. The
+background updater only runs for `daemon --updates` and the menu.
+"""
 import sys
-import platform
-import subprocess
-import shutil
-from plyer import notification
+import time
+from datetime import date
+
+from quote import _quote, get_quote_list, reload_quote_list
+import stats
 
-from quote import quote_list, _quote
+# Longest single wait in the schedulers: a notification due while the machine was
+# suspended fires at most this late after the resume, for 96 wakeups a day
+MAX_SLEEP = 15 * 60.0
 
 class PersistentQuoteManager:
-    def __init__(self, quotes: List[_quote], data_file: str = "quote_data.json"):
+    def __init__(self, quotes: list[_quote], data_file: str = "quote_data.json",
+                 state: 'StateBackend | None' = None, subscriber: str = "default",
+                 calendar: 'QuoteCalendar | None' = None, recent_window: int = 20,
+                 verbose: bool = True):
+        if calendar is None:
+            from dailycalendar import get_calendar
+            calendar = get_calendar()
+        if state is None:
+            from state import JsonStateBackend
+            state = JsonStateBackend(data_file)
         self.quotes = quotes
+        self.calendar = calendar
         self.data_file = data_file
+        self.state = state
+        self.subscriber = subscriber
+        self.verbose = verbose
+        self._date_index = None
+        self._sampler: 'Sampler | None' = None
+        self._retired = None
+        self.recent_window = recent_window
+        self.updater: 'QuoteUpdater | None' = None
         self.load_state()
+
+    def replace_quotes(self, quotes: list[_quote]):
+        """Swap in a freshly loaded corpus; used by the background updater
+
+        The quotes are assigned first: the sampler and date index check which
+        list they were built from, so one built concurrently from the old
+        list is replaced on its next use. The old store is closed on the
+        next swap, when no call that picked it up can still be reading it.
+        """
+        import quote
+        old = self.quotes
+        self.quotes = quotes
+        self._date_index = None
+        self._sampler = None
+        retired, self._retired = self._retired, (old if old is not quotes else None)
+        # A memory-mapped store holds a mapping and a file descriptor until closed
+        if retired is not None and retired is not quotes and retired is not quote._quote_list \
+                and hasattr(retired, "close"):
+            retired.close()
+
+    def start_updates(self, interval: float = 60 * 60):
+        """Keep the quotes up to date from a background thread"""
+        if self.updater is None:
+            from updater import QuoteUpdater
+            self.updater = QuoteUpdater(self.replace_quotes, interval=interval)
+        self.updater.start()
     
     def load_state(self):
-        """Load the last shown quote and date from file"""
-        if os.path.exists(self.data_file):
-            try:
-                with open(self.data_file, 'r') as f:
-                    data = json.load(f)
-                    self.last_date = datetime.strptime(data['last_date'], '%Y-%m-%d').date()
-                    self.last_quote_index = data['last_quote_index']
-                    print(f"Loaded state: last quote shown on {self.last_date}")
-            except (json.JSONDecodeError, KeyError):
-                # File exists but corrupted, initialize fresh
-                self.initialize_state()
-        else:
+        """Load the last shown quote and date from the state backend"""
+        data = self.state.get(self.subscriber)
+        if data is None:
+            self.initialize_state()
+            return
+        try:
+            self.last_date = date.fromisoformat(data['last_date'])
+            # States written before stable ids only have a position; today's quote is picked again
+            self.last_quote_id = data.get('last_quote_id')
+            if self.verbose:
+                print(f"Loaded state: last quote shown on {self.last_date}")
+        except (ValueError, KeyError):
+            # State exists but corrupted, initialize fresh
             self.initialize_state()
     
     def initialize_state(self):
         """Initialize with today's date and no previous quote"""
         self.last_date = date.today()
-        self.last_quote_index = -1
-        print("Initialized new quote state")
+        self.last_quote_id = None
+        if self.verbose:
+            print("Initialized new quote state")
     
     def save_state(self):
-        """Save current state to file"""
+        """Save current state to the state backend"""
         data = {
             'last_date': self.last_date.isoformat(),
-            'last_quote_index': self.last_quote_index
+            'last_quote_id': self.last_quote_id
         }
-        with open(self.data_file, 'w') as f:
-            json.dump(data, f)
+        self.state.set(self.subscriber, data)
     
+    @stats.timed("daily_quote")
     def get_daily_quote(self) -> _quote:
-        """Get today's quote (same quote all day)"""
-        print("Downloading Updates...")
-        try:
-            result = subprocess.run(
-                ["git", "pull"],
-                capture_output=True,
-                text=True)
-            if result.stderr:
-                resp = input("Clone from repository? [Y/n]")
-                if resp.lower().strip() in ("n", "no"):
-                    print("Will not clone.")
-                else:
-                    result = subprocess.run(["git", "clone", "https://github.com/Eddy12597/JordiQuotes.git"],
-                                        capture_output=True,
-                                        text=True)
-            if result.stderr:
-                print(f"An error occurred during 'git pull': {result.stderr}")
-                if platform.system() == "Darwin":
-                    resp = input("Run 'brew install git'? [Y/n]")
-                    if resp.lower().strip() in ("n", "no"):
-                        print("Will not install.")
-                    else:
-                        print("Installing: 'brew install git'")
-                        gitinstallresult = subprocess.run(["brew", "install", "git"], text=True, capture_output=True)
-                        if gitinstallresult.stderr:
-                            print(f"An Error occurred during 'brew install git': {result.stderr}")
-                        else:
-                            print(f"Successfully installed git. Downloading updates...")
-                            gitpullafterinstresult = subprocess.run(["cd .. && git clone https://github.com/Eddy12597/JordiQuotes.git && cd JordiQuotes"], shell=True, capture_output=True, text=True)
-                            if gitpullafterinstresult.stderr:
-                                print(f"An error occurred during 'git clone ...' after git is installed: {gitpullafterinstresult.stderr}")
-                            else:
-                                print(f"Successfully updated")
-                elif platform.system() == "Windows":
-                    resp = input("Install git via cURL? [Y/n]")
-                    if resp.lower().strip() in ("n", "no"):
-                        print("Will not install.")
-                    else:
-                        print("running command:")
-                        print('curl -L -o git-installer.exe https://github.com/git-for-windows/git/releases/download/v2.52.0.windows.1/Git-2.52.0-64-bit.exe; Start-Process git-installer.exe -ArgumentList "/VERYSILENT", "/NORESTART", "/NOCANCEL", "/SP-", "/CLOSEAPPLICATIONS", "/RESTARTAPPLICATIONS", "/COMPONENTS=icons,ext\\reg\\shellhere,assoc,assoc_sh" -Wait')
-                        wininstres = subprocess.run('curl -L -o git-installer.exe https://github.com/git-for-windows/git/releases/download/v2.52.0.windows.1/Git-2.52.0-64-bit.exe && Start-Process git-installer.exe -ArgumentList "/VERYSILENT", "/NORESTART", "/NOCANCEL", "/SP-", "/CLOSEAPPLICATIONS", "/RESTARTAPPLICATIONS", "/COMPONENTS=icons,ext\\reg\\shellhere,assoc,assoc_sh" -Wait')
-                        if wininstres.stderr:
-                            print(f"An error occurred: {wininstres.stderr}")
-                        else:
-                            print(f"Git installed. Cloning repository...")
-                            clretr = subprocess.run(["git", "clone", "https://github.com/Eddy12597/JordiQuotes"])
-                            if clretr.stderr:
-                                print(f"An error occurred in cloning after git is installed: {clretr.stderr}")
-                            else:
-                                print(f"Update complete!")
-                elif platform.system() == "Linux":
-                    import distro
-                    if distro.name() == "Arch Linux":
-                        print("Distro: Arch Linux. I also use arch btw.")
-                        archgitres = subprocess.run(["sudo", "pacman", "-S", "git"])
-                        if archgitres.stderr:
-                            print(f"An error occurred: {archgitres.stderr}")
-                            
-            else:
-                print("Update complete!")
-            
-        except Exception as e:
-            print("An error occurred during update:", str(e))
-            
+        """Get today's quote (same quote all day)
 
+        Never touches the network: updates arrive through start_updates().
+        The quote is remembered by id, so it stays the same all day even if
+        an update adds or removes quotes before it.
+        """
         today = date.today()
         
         # If we already showed a quote today, return the same one
-        if today == self.last_date and self.last_quote_index != -1:
-            return self.quotes[self.last_quote_index]
+        if today == self.last_date and self.last_quote_id is not None:
+            q = self.quotes.get(self.last_quote_id)
+            if q is not None:
+                return q
         
-        # New day - get new random quote (consistent for the day)
+        # New day - look up the calendar (same quote for everyone all day)
         self.last_date = today
-        random.seed(today.toordinal())  # Same seed for entire day
-        self.last_quote_index = random.randint(0, len(self.quotes) - 1)
+        new_quote = self.quotes[self.calendar.index_for(today, self.quotes)]
+        self.last_quote_id = new_quote.id
         self.save_state()
         
-        new_quote = self.quotes[self.last_quote_index]
-        print(f"New daily quote selected: {new_quote.origin}")
+        if self.verbose:
+            print(f"New daily quote selected: {new_quote.origin}")
         return new_quote
     
-    def get_random_quote(self) -> _quote:
-        """Get a completely random quote (for manual requests)"""
-        return random.choice(self.quotes)
-
-def show_macos_notification(quote: _quote):
-    """Show macOS notification using terminal-notifier or AppleScript fallback"""
-    message = str(quote)
-    if len(message) > 200:
-        message = message[:197] + "..."
-    
-    # Escape quotes for shell commands
-    escaped_message = message.replace('"', '\\"').replace('`', '\\`')
-    escaped_origin = quote.origin.replace('"', '\\"').replace('`', '\\`')
-    
-    # Try terminal-notifier first (most reliable)
-    if shutil.which('terminal-notifier'):
-        try:
-            subprocess.run([
-                'terminal-notifier',
-                '-title', '📖 Daily Quote',
-                '-subtitle', escaped_origin,
-                '-message', escaped_message,
-                '-sound', 'default',
-                '-timeout', '15'
-            ], check=True, capture_output=True)
-            print(f"Notification shown via terminal-notifier: {quote.origin}")
-            return
-        except subprocess.CalledProcessError as e:
-            print(f"terminal-notifier failed: {e}")
-    
-    # Fallback to AppleScript
-    try:
-        applescript = f'''
-        display notification "{escaped_message}" with title "📖 Daily Quote" subtitle "{escaped_origin}" sound name "default"
-        '''
-        subprocess.run(['osascript', '-e', applescript], check=True, capture_output=True)
-        print(f"Notification shown via AppleScript: {quote.origin}")
-    except subprocess.CalledProcessError as e:
-        print(f"AppleScript notification failed: {e}")
-        # Ultimate fallback - just print
-        print("🔔 Daily Quote Notification (Fallback):")
-        print(f"📖 {message}")
-        print(f"📍 {quote.origin}")
-
-def show_windows_notification(quote: _quote):
-    """Show Windows notification using plyer"""
+    def get_quote_for(self, day: date) -> _quote:
+        """Get the daily quote for any day, past or future"""
+        return self.quotes[self.calendar.index_for(day, self.quotes)]
+
+    @property
+    def sampler(self) -> 'Sampler':
+        quotes = self.quotes
+        sampler = self._sampler
+        if sampler is None or sampler.quotes is not quotes:
+            from sampler import Sampler
+            sampler = self._sampler = Sampler(quotes, window=self.recent_window)
+        return sampler
+
+    def get_random_quote(self, year: int | None = None, speaker: str | None = None,
+                         weighted: bool = False) -> _quote:
+        """Get a random quote (for manual requests), skipping recently shown ones
+
+        year/speaker narrow the pick (speaker is "student" or "teacher");
+        weighted favours newer quotes.
+        """
+        sampler = self.sampler
+        return sampler.quotes[sampler.sample(year, speaker, weighted)]
+
+    def get_anniversary_quotes(self, day: date | None = None) -> list[_quote]:
+        """Get quotes said on this month and day in earlier years"""
+        day = day or date.today()
+        quotes = self.quotes
+        index = self._date_index
+        if index is None or index.quotes is not quotes:
+            from dateindex import DateIndex
+            index = self._date_index = DateIndex(quotes)
+        return [q for q in index.on_this_day(day.month, day.day) if q.date[0] < day.year]
+
+def interactive_update():
+    """Pull updates in the foreground, offering to clone or install git if needed.
+
+    This prompts for input, so it is only used from the menu; scheduled
+    quotes are kept up to date by the background QuoteUpdater instead.
+    """
+    import platform
+    import subprocess
+    print("Downloading Updates...")
     try:
-        message = str(quote)
-        if len(message) > 200:
-            message = message[:197] + "..."
+        result = subprocess.run(
+            ["git", "pull"],
+            capture_output=True,
+            text=True)
+        if result.stderr:
+            resp = input("Clone from repository? [Y/n]")
+            if resp.lower().strip() in ("n", "no"):
+                print("Will not clone.")
+            else:
+                result = subprocess.run(["git", "clone", "https://github.com/Eddy12597/JordiQuotes.git"],
+                                    capture_output=True,
+                                    text=True)
+        if result.stderr:
+            print(f"An error occurred during 'git pull': {result.stderr}")
+            if platform.system() == "Darwin":
+                resp = input("Run 'brew install git'? [Y/n]")
+                if resp.lower().strip() in ("n", "no"):
+                    print("Will not install.")
+                else:
+                    print("Installing: 'brew install git'")
+                    gitinstallresult = subprocess.run(["brew", "install", "git"], text=True, capture_output=True)
+                    if gitinstallresult.stderr:
+                        print(f"An Error occurred during 'brew install git': {result.stderr}")
+                    else:
+                        print(f"Successfully installed git. Downloading updates...")
+                        gitpullafterinstresult = subprocess.run(["cd .. && git clone https://github.com/Eddy12597/JordiQuotes.git && cd JordiQuotes"], shell=True, capture_output=True, text=True)
+                        if gitpullafterinstresult.stderr:
+                            print(f"An error occurred during 'git clone ...' after git is installed: {gitpullafterinstresult.stderr}")
+                        else:
+                            print(f"Successfully updated")
+            elif platform.system() == "Windows":
+                resp = input("Install git via cURL? [Y/n]")
+                if resp.lower().strip() in ("n", "no"):
+                    print("Will not install.")
+                else:
+                    print("running command:")
+                    print('curl -L -o git-installer.exe https://github.com/git-for-windows/git/releases/download/v2.52.0.windows.1/Git-2.52.0-64-bit.exe; Start-Process git-installer.exe -ArgumentList "/VERYSILENT", "/NORESTART", "/NOCANCEL", "/SP-", "/CLOSEAPPLICATIONS", "/RESTARTAPPLICATIONS", "/COMPONENTS=icons,ext\\reg\\shellhere,assoc,assoc_sh" -Wait')
+                    wininstres = subprocess.run('curl -L -o git-installer.exe https://github.com/git-for-windows/git/releases/download/v2.52.0.windows.1/Git-2.52.0-64-bit.exe && Start-Process git-installer.exe -ArgumentList "/VERYSILENT", "/NORESTART", "/NOCANCEL", "/SP-", "/CLOSEAPPLICATIONS", "/RESTARTAPPLICATIONS", "/COMPONENTS=icons,ext\\reg\\shellhere,assoc,assoc_sh" -Wait')
+                    if wininstres.stderr:
+                        print(f"An error occurred: {wininstres.stderr}")
+                    else:
+                        print(f"Git installed. Cloning repository...")
+                        clretr = subprocess.run(["git", "clone", "https://github.com/Eddy12597/JordiQuotes"])
+                        if clretr.stderr:
+                            print(f"An error occurred in cloning after git is installed: {clretr.stderr}")
+                        else:
+                            print(f"Update complete!")
+            elif platform.system() == "Linux":
+                import distro
+                if distro.name() == "Arch Linux":
+                    print("Distro: Arch Linux. I also use arch btw.")
+                    archgitres = subprocess.run(["sudo", "pacman", "-S", "git"])
+                    if archgitres.stderr:
+                        print(f"An error occurred: {archgitres.stderr}")
+                        
+        else:
+            print("Update complete!")
         
-        notification.notify(
-            title="📖 Daily Quote",
-            message=message,
-            timeout=15,
-            app_name="Quote App",
-            toast=True
-        )
-        print(f"Notification shown: {quote.origin}")
     except Exception as e:
-        print(f"Error showing Windows notification: {e}")
+        print("An error occurred during update:", str(e))
 
-def show_linux_notification(quote: _quote):
-    """Show Linux notification using plyer or notify-send"""
-    message = str(quote)
-    if len(message) > 200:
-        message = message[:197] + "..."
-    
+def show_notification(quote: _quote, wait: bool = True):
+    """Show desktop notification through the shared dispatcher
+
+    Backends are probed once per process; see notify.py.
+    """
+    from notify import get_dispatcher
+    from render import render
+    fut = get_dispatcher().submit("📖 Daily Quote", render(quote, "notification"), quote.origin)
+    if not wait:
+        return
     try:
-        notification.notify(
-            title="📖 Daily Quote",
-            message=message,
-            timeout=15,
-            app_name="Quote App"
-        )
-        print(f"Notification shown via plyer: {quote.origin}")
-    except Exception:
-        # Fallback to notify-send
-        try:
-            subprocess.run([
-                'notify-send',
-                '📖 Daily Quote',
-                f'{message}\n\n— {quote.origin}',
-                '-t', '15000',  # 15 seconds
-                '-i', 'dialog-information'
-            ], check=True)
-            print(f"Notification shown via notify-send: {quote.origin}")
-        except (subprocess.CalledProcessError, FileNotFoundError) as e:
-            print(f"Linux notification failed: {e}")
-            print("🔔 Daily Quote (Fallback):", message)
-
-def show_notification(quote: _quote):
-    """Show desktop notification with platform-specific handling"""
-    system = platform.system()
-    
-    if system == "Darwin":  # macOS
-        show_macos_notification(quote)
-    elif system == "Windows":
-        show_windows_notification(quote)
-    else:  # Linux and other Unix-like systems
-        show_linux_notification(quote)
+        print(f"Notification shown via {fut.result()}: {quote.origin}")
+    except Exception as e:
+        print(f"Notification failed: {e}")
+
+def daily_job(manager: PersistentQuoteManager):
+    """One scheduler cycle: pick today's quote and notify"""
+    stats.incr("scheduler_cycles")
+    show_notification(manager.get_daily_quote())
+    if _prometheus_file:
+        stats.write_prometheus(_prometheus_file)
+
+
+# Set from the command line in main()
+_prometheus_file: str | None = None
+_profile_file: str | None = None
+
+
+def _scheduled_job(manager: PersistentQuoteManager):
+    job = lambda: daily_job(manager)
+    return stats.profile_once(job, _profile_file) if _profile_file else job
+
 
 def print_quote(quote: _quote):
     """Print quote to console"""
@@ -246,12 +282,16 @@ def print_quote(quote: _quote):
 # DIFFERENT SCHEDULING STRATEGIES
 # =============================================
 
-def run_simple_scheduler(manager: PersistentQuoteManager, notification_time: str = "09:00"):
+def run_simple_scheduler(manager: PersistentQuoteManager, notification_time: str = "09:00",
+                         updates: bool = True):
     """
-    Strategy 1: Using schedule library (recommended)
-    Most flexible and reliable
+    Strategy 1: Event-driven scheduler (recommended)
+    Sleeps until the notification is due, no polling
     """
+    from scheduler import Scheduler
     print(f"Starting simple scheduler - quotes will show daily at {notification_time}")
+    if updates:
+        manager.start_updates()
     
     # Show immediate quote on startup
     quote = manager.get_daily_quote()
@@ -259,14 +299,11 @@ def run_simple_scheduler(manager: PersistentQuoteManager, notification_time: str
     print_quote(quote)
     
     # Schedule daily notification
-    schedule.every().day.at(notification_time).do(
-        lambda: show_notification(manager.get_daily_quote())
-    )
+    scheduler = Scheduler(max_sleep=MAX_SLEEP)
+    scheduler.every_day_at(notification_time, _scheduled_job(manager))
     
     try:
-        while True:
-            schedule.run_pending()
-            time.sleep(60)  # Check every minute - low CPU
+        scheduler.run()
     except KeyboardInterrupt:
         print("\nStopping quote scheduler...")
 
@@ -276,12 +313,13 @@ def run_sleep_scheduler(manager: PersistentQuoteManager):
     Low CPU but less flexible
     """
     print("Starting sleep-based scheduler - 24-hour intervals")
+    manager.start_updates()
     
+    job = _scheduled_job(manager)
     while True:
         try:
-            quote = manager.get_daily_quote()
-            show_notification(quote)
-            print_quote(quote)
+            job()
+            print_quote(manager.get_daily_quote())
             
             # Wait 24 hours
             print("Waiting 24 hours for next quote...")
@@ -298,21 +336,24 @@ def run_threaded_scheduler(manager: PersistentQuoteManager, notification_time: s
     """
     Strategy 3: Threaded scheduler with graceful shutdown
     """
+    import threading
+    from scheduler import Scheduler
+
     class QuoteScheduler:
         def __init__(self, manager):
             self.manager = manager
-            self.running = False
+            self.scheduler = Scheduler(max_sleep=MAX_SLEEP)
             self.thread = None
         
         def start(self):
-            self.running = True
+            self.scheduler.every_day_at(notification_time, _scheduled_job(self.manager))
             self.thread = threading.Thread(target=self._run)
             self.thread.daemon = True
             self.thread.start()
             print(f"Threaded scheduler started - daily at {notification_time}")
         
         def stop(self):
-            self.running = False
+            self.scheduler.stop()
             if self.thread:
                 self.thread.join(timeout=5)
         
@@ -322,23 +363,10 @@ def run_threaded_scheduler(manager: PersistentQuoteManager, notification_time: s
             show_notification(quote)
             print_quote(quote)
             
-            while self.running:
-                try:
-                    schedule.every().day.at(notification_time).do(
-                        lambda: show_notification(self.manager.get_daily_quote())
-                    )
-                    
-                    # Check schedule every minute
-                    for _ in range(60):  # 60 minutes
-                        if not self.running:
-                            return
-                        schedule.run_pending()
-                        time.sleep(60)
-                        
-                except Exception as e:
-                    print(f"Scheduler error: {e}")
-                    time.sleep(60)
+            # Sleeps until each fire; stop() wakes it immediately
+            self.scheduler.run()
     
+    manager.start_updates()
     scheduler = QuoteScheduler(manager)
     scheduler.start()
     
@@ -354,8 +382,138 @@ def run_threaded_scheduler(manager: PersistentQuoteManager, notification_time: s
 # MAIN APPLICATION
 # =============================================
 
-def main():
+def _with_id(quote: _quote) -> str:
+    """str(quote) plus the id that `show` takes"""
+    return f"{quote}  [id {quote.id}]"
+
+def _manager(args, verbose: bool = False) -> PersistentQuoteManager:
+    """Manager over the cached corpus, with the state backend chosen on the command line"""
+    state = None
+    if getattr(args, "state_db", None):
+        from state import SQLiteStateBackend
+        state = SQLiteStateBackend(args.state_db)
+    return PersistentQuoteManager(get_quote_list(), state=state,
+                                  subscriber=getattr(args, "subscriber", "default"), verbose=verbose)
+
+def _cmd_today(args):
+    manager = _manager(args)
+    quote = manager.get_daily_quote()
+    print(_with_id(quote))
+    if args.notify:
+        show_notification(quote)
+
+def _cmd_random(args):
+    manager = _manager(args)
+    try:
+        print(_with_id(manager.get_random_quote(args.year, args.speaker, args.weighted)))
+    except LookupError as e:
+        print(e)
+        return 1
+
+def _cmd_show(args):
+    q = get_quote_list().get(args.id)
+    if q is None:
+        print(f"No quote with id {args.id}")
+        return 1
+    print(q)
+
+def _cmd_search(args):
+    from search import search
+    results = search(" ".join(args.query), args.limit)
+    if not results:
+        print("No matches.")
+        return 1
+    for quote in results:
+        print(_with_id(quote))
+
+def _cmd_serve(args):
+    import asyncio
+    import server
+    try:
+        asyncio.run(server.serve(args.host, args.port, _manager(args, verbose=True)))
+    except KeyboardInterrupt:
+        print("\nStopping quote server...")
+
+def _cmd_daemon(args):
+    run_simple_scheduler(_manager(args, verbose=True), args.at, updates=args.updates)
+
+def _parser():
+    import argparse
+    parser = argparse.ArgumentParser(description="Daily Jordi quotes")
+    parser.add_argument("--stats", action="store_true",
+                        help="time extraction, loading, selection, updates and notifications; print a summary on exit")
+    parser.add_argument("--prometheus", metavar="FILE",
+                        help="also write the stats to FILE in Prometheus text format after every cycle and on exit")
+    parser.add_argument("--state-db", metavar="FILE",
+                        help="keep the daily state in this SQLite database instead of quote_data.json")
+    parser.add_argument("--subscriber", default="default",
+                        help="whose daily state to use with --state-db")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="run the first scheduler cycle under cProfile and save the profile to FILE")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    p = commands.add_parser("today", help="print today's quote")
+    p.add_argument("--notify", action="store_true", help="also show it as a desktop notification")
+    p.set_defaults(run=_cmd_today)
+
+    p = commands.add_parser("random", help="print a random quote")
+    p.add_argument("--year", type=int)
+    p.add_argument("--speaker", choices=("student", "teacher"))
+    p.add_argument("--weighted", action="store_true", help="favour newer quotes")
+    p.set_defaults(run=_cmd_random)
+
+    p = commands.add_parser("show", help="print one quote by id")
+    p.add_argument("id", type=int)
+    p.set_defaults(run=_cmd_show)
+
+    p = commands.add_parser("search", help="full-text search")
+    p.add_argument("query", nargs="+")
+    p.add_argument("--limit", type=int, default=10)
+    p.set_defaults(run=_cmd_search)
+
+    p = commands.add_parser("serve", help="run the HTTP quote service")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8067)
+    p.set_defaults(run=_cmd_serve)
+
+    p = commands.add_parser("daemon", help="show a notification every day")
+    p.add_argument("--at", default="07:59", metavar="HH:MM", help="notification time (default: 07:59)")
+    p.add_argument("--updates", action="store_true", help="pull new quotes in the background")
+    p.set_defaults(run=_cmd_daemon)
+    return parser
+
+def _fast_today(argv: list[str]):
+    """`today` without argparse, which costs more to import than the command takes"""
+    class args:
+        notify = "--notify" in argv
+    return _cmd_today(args)
+
+def main(argv: list[str] | None = None):
+    global _prometheus_file, _profile_file
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "today" and set(argv[1:]) <= {"--notify"}:
+        return _fast_today(argv[1:])
+    args = _parser().parse_args(argv)
+    if args.stats or args.prometheus:
+        stats.enable()
+    _prometheus_file = args.prometheus
+    _profile_file = args.profile
+    try:
+        if args.command is None:
+            return _menu()
+        return args.run(args)
+    finally:
+        if args.stats:
+            print(stats.report())
+        if args.prometheus:
+            stats.write_prometheus(args.prometheus)
+
+def _menu():
+    import platform
+    import shutil
+
     # Initialize quote manager
+    quote_list = get_quote_list()
     manager = PersistentQuoteManager(quote_list)
     
     print(f"Loaded {len(quote_list)} quotes")
@@ -371,16 +529,18 @@ def main():
             print("   brew install terminal-notifier")
     print("=" * 40)
     
-    print("1. Run with schedule library (recommended)")
+    print("1. Run with event-driven scheduler (recommended)")
     print("2. Run with simple sleep scheduler")
     print("3. Run with threaded scheduler")
     print("4. Show today's quote once and exit")
     print("5. Show random quote")
     print("6. Test notification")
+    print("7. Show quotes from this day in earlier years")
+    print("8. Download updates now")
     print("=" * 40)
     
     try:
-        choice = input("Choose option ([1]-6): ").strip()
+        choice = input("Choose option ([1]-8): ").strip()
             
         if choice == "2":
             run_sleep_scheduler(manager)
@@ -404,6 +564,18 @@ def main():
             show_notification(quote)
             print_quote(quote)
             print("Notification test completed")
+
+        elif choice == "7":
+            quotes = manager.get_anniversary_quotes()
+            if not quotes:
+                print("\nNo quotes from this day in earlier years.")
+            for quote in quotes:
+                print_quote(quote)
+
+        elif choice == "8":
+            interactive_update()
+            manager.replace_quotes(reload_quote_list())
+            print(f"Loaded {len(manager.quotes)} quotes")
             
         else:
             time_str = input("Enter notification time (HH:MM) [07:59]: ").strip()
@@ -416,4 +588,4 @@ def main():
         print(f"Application error: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
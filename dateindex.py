@@ -0,0 +1,91 @@
+"""Sorted date index over the quote corpus.
+
+Dates are compared as packed keys (see quote.pack_date), so the index is two
+sorted arrays and every lookup is a pair of binary searches.
+
+Partial dates:
+- A quote without a month (e.g. the year headers' (2022, None, 1)) is only
+  known to be in that year. It matches in_year() and year-wide ranges, never
+  in_month() or on_this_day().
+- A quote without a day matches in_month() for its month and ranges covering
+  the whole month, never on_this_day().
+- Missing parts of a range's start are treated as the earliest possible value
+  and missing parts of its end as the latest, so between((2024,), (2024,))
+  is the same as in_year(2024).
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+import quote
+from quote import _quote, pack_date
+
+
+def _bound(d, end: bool) -> int:
+    """Packed key for a range bound given as a date or a (year[, month[, day]]) tuple"""
+    if isinstance(d, date):
+        d = (d.year, d.month, d.day)
+    year, month, day = (tuple(d) + (None, None))[:3]
+    fill = 99 if end else 0
+    return year * 10000 + (fill if month is None else month) * 100 + (fill if day is None else day)
+
+
+class DateIndex:
+    def __init__(self, quotes):
+        self.quotes = quotes
+        date_key = getattr(quotes, "date_key", None)
+        n = len(quotes)
+        keys = [date_key(i) if date_key is not None else pack_date(quotes[i].date) for i in range(n)]
+        # A day without a month carries no calendar information
+        keys = [k - k % 100 if (k % 10000) // 100 == 0 else k for k in keys]
+        by_date = sorted(range(n), key=keys.__getitem__)
+        self._order = array('I', by_date)
+        self._keys = array('i', (keys[i] for i in by_date))
+        # Month/day first, for "on this day" across years; partial dates left out
+        full = [i for i in by_date if keys[i] % 100 and (keys[i] % 10000) // 100]
+        full.sort(key=lambda i: keys[i] % 10000)
+        self._md_order = array('I', full)
+        self._md_keys = array('i', (keys[i] % 10000 for i in full))
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def _slice(self, lo_key: int, hi_key: int) -> list[int]:
+        lo = bisect_left(self._keys, lo_key)
+        hi = bisect_right(self._keys, hi_key)
+        return self._order[lo:hi].tolist()
+
+    def between_indices(self, start, end) -> list[int]:
+        """Store positions of quotes dated within [start, end], oldest first"""
+        return self._slice(_bound(start, False), _bound(end, True))
+
+    def on_this_day_indices(self, month: int, day: int) -> list[int]:
+        """Store positions of quotes dated month/day in any year, oldest first"""
+        md = month * 100 + day
+        lo = bisect_left(self._md_keys, md)
+        hi = bisect_right(self._md_keys, md)
+        return self._md_order[lo:hi].tolist()
+
+    def between(self, start, end) -> list[_quote]:
+        return [self.quotes[i] for i in self.between_indices(start, end)]
+
+    def in_year(self, year: int) -> list[_quote]:
+        return self.between((year,), (year,))
+
+    def in_month(self, year: int, month: int) -> list[_quote]:
+        return self.between((year, month), (year, month))
+
+    def on_this_day(self, month: int, day: int) -> list[_quote]:
+        return [self.quotes[i] for i in self.on_this_day_indices(month, day)]
+
+
+_date_index: DateIndex | None = None
+
+
+def get_date_index() -> DateIndex:
+    """Return the index over quote_list, building it on first use"""
+    global _date_index
+    quotes = quote.get_quote_list()
+    if _date_index is None or _date_index.quotes is not quotes:
+        _date_index = DateIndex(quotes)
+    return _date_index
@@ -0,0 +1,187 @@
+"""Near-duplicate detection for the quote corpus (MinHash + LSH).
+
+    python dedup.py [FILE] [--threshold 0.6] [--mode keep|merge|drop] [--out quotes.json]
+
+Each quote is normalized (lower case, punctuation dropped, repeated letters
+squeezed so "Siiiix" and "Six" agree) and cut into character 3-grams. A
+one-permutation MinHash signature is built from one pass over the shingles,
+and signatures are split into bands: quotes sharing any band land in the same
+bucket. Only bucket members are compared, against the bucket's first quote
+and on their exact shingle sets, so the work grows linearly with the corpus
+instead of with every pair.
+
+Clusters are handled by mode:
+- keep:  report only, the corpus is unchanged
+- drop:  keep the first occurrence of each cluster
+- merge: one quote per cluster, at the first occurrence's place and date,
+         with the longest wording (and the stable id of that wording)
+"""
+from array import array
+import argparse
+import re
+
+import quote
+from quote import _quote
+import stats
+
+MODES = ("keep", "merge", "drop")
+
+_MASK = (1 << 64) - 1
+_MIX = 0x9E3779B97F4A7C15
+_EMPTY = 1 << 64
+_VALUE = (1 << 32) - 1
+_junk = re.compile(r"[^a-z0-9]+")
+_runs = re.compile(r"(.)\1+")
+
+
+def normalize(text: str) -> str:
+    text = _junk.sub(" ", text.lower()).strip()
+    return _runs.sub(r"\1", text)
+
+
+def shingles(text: str, k: int = 3) -> set[int]:
+    """Character k-grams of the normalized text as integers (k <= 8)"""
+    data = normalize(text).encode("utf-8")
+    if len(data) <= k:
+        return {int.from_bytes(data, "little")}
+    return {int.from_bytes(data[i:i + k], "little") for i in range(len(data) - k + 1)}
+
+
+def signature(grams: set[int], size: int) -> list[int]:
+    """One-permutation MinHash: hash once, keep the minimum per bin.
+
+    Empty bins borrow the next filled bin's value (rotation densification),
+    so two signatures agree in a bin with probability close to the Jaccard
+    similarity of the shingle sets. Values are cut to 32 bits so a corpus of
+    signatures fits in one array('I').
+    """
+    sig = [_EMPTY] * size
+    for g in grams:
+        h = (g * _MIX) & _MASK
+        h ^= h >> 29
+        b = h % size
+        v = h // size
+        if v < sig[b]:
+            sig[b] = v
+    if _EMPTY in sig:
+        filled = [i for i, v in enumerate(sig) if v != _EMPTY]
+        if filled:
+            for i in range(size):
+                if sig[i] == _EMPTY:
+                    j = next((f for f in filled if f > i), filled[0])
+                    sig[i] = sig[j] + ((j - i) % size) * _MIX
+    return [v & _VALUE for v in sig]
+
+
+def similarity(a, b) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+def _find(parent: list[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+@stats.timed("dedup")
+def find_duplicates(quotes, threshold: float = 0.6, bands: int = 8, rows: int = 4,
+                    k: int = 3) -> list[list[int]]:
+    """Clusters of near-duplicate quotes as lists of store positions.
+
+    Only clusters with two or more quotes are returned, each sorted, in
+    order of their first member. `threshold` is the Jaccard similarity of the
+    shingle sets. With the default 8 bands of 4 rows, pairs at 0.6 are caught
+    about two times in three and pairs at 0.8 almost always.
+    """
+    size = bands * rows
+    content = getattr(quotes, "content", None)
+    text = content if content is not None else (lambda i: quotes[i].content)
+    n = len(quotes)
+    sigs = array('I')
+    for i in range(n):
+        sigs.extend(signature(shingles(text(i), k), size))
+    parent = list(range(n))
+
+    def close(i: int, j: int) -> bool:
+        # Signatures are only an estimate; confirm candidates on the real shingles
+        if similarity(sigs[i * size:(i + 1) * size], sigs[j * size:(j + 1) * size]) < threshold - 0.2:
+            return False
+        a, b = shingles(text(i), k), shingles(text(j), k)
+        return len(a & b) >= threshold * len(a | b)
+
+    for band in range(bands):
+        first: dict[bytes, int] = {}
+        offset = band * rows
+        for i in range(n):
+            lo = i * size + offset
+            j = first.setdefault(sigs[lo:lo + rows].tobytes(), i)
+            if j == i:
+                continue
+            ri, rj = _find(parent, i), _find(parent, j)
+            if ri != rj and close(i, j):
+                parent[max(ri, rj)] = min(ri, rj)
+    groups: dict[int, list[int]] = {}
+    for i in range(n):
+        groups.setdefault(_find(parent, i), []).append(i)
+    return [members for root, members in sorted(groups.items()) if len(members) > 1]
+
+
+def apply(quotes, clusters: list[list[int]], mode: str = "keep") -> list[_quote]:
+    """The corpus with every cluster kept, dropped to its first quote, or merged"""
+    if mode not in MODES:
+        raise ValueError(f"unknown mode {mode!r}, expected one of {MODES}")
+    out = list(quotes)
+    if mode == "keep":
+        return out
+    removed: set[int] = set()
+    for members in clusters:
+        removed.update(members[1:])
+    if mode == "merge":
+        # A merged quote's id is the stable id of its new content
+        heads = {members[0] for members in clusters}
+        taken = {q.id for i, q in enumerate(out) if i not in removed and i not in heads}
+        for members in clusters:
+            longest = max((out[i] for i in members), key=lambda q: len(q.content))
+            first = out[members[0]]
+            id = quote._unique_id(longest.content, first.date, taken.__contains__)
+            taken.add(id)
+            out[members[0]] = _quote._make(longest.content, first.date, first.origin, id)
+    return [q for i, q in enumerate(out) if i not in removed]
+
+
+def dedupe(quotes, mode: str = "keep", threshold: float = 0.6) -> tuple[list[_quote], list[list[int]]]:
+    """find_duplicates() then apply(); returns the new corpus and the clusters"""
+    clusters = find_duplicates(quotes, threshold)
+    return apply(quotes, clusters, mode), clusters
+
+
+def report(quotes, clusters: list[list[int]]) -> str:
+    lines = [f"{len(clusters)} near-duplicate cluster(s), "
+             f"{sum(len(c) - 1 for c in clusters)} redundant quote(s)"]
+    for n, members in enumerate(clusters, 1):
+        lines.append(f"\n#{n} ({len(members)} quotes)")
+        for i in members:
+            text = quotes[i].content.replace("\n", " / ")
+            lines.append(f"  [{i}] {text[:100]}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Find near-duplicate quotes")
+    parser.add_argument("file", nargs="?", default=quote._source_file)
+    parser.add_argument("--threshold", type=float, default=0.6)
+    parser.add_argument("--mode", choices=MODES, default="keep", help="what to do with clusters")
+    parser.add_argument("--out", help="write the resulting quotes to this JSON file")
+    args = parser.parse_args(argv)
+    quotes = quote.extract(args.file)
+    deduped, clusters = dedupe(quotes, args.mode, args.threshold)
+    print(report(quotes, clusters))
+    if args.out:
+        quote.encode_quotes_to_json(args.out, deduped)
+        print(f"\nWrote {len(deduped)} quotes ({len(quotes) - len(deduped)} removed) to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
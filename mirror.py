@@ -0,0 +1,89 @@
+"""Keep a local copy of a quote server's corpus (see server.py) in sync.
+
+    python mirror.py http://127.0.0.1:8067 [--out mirror_quotes.json]
+
+Quotes have stable ids (see quote.stable_id), so the server's manifest is
+all a mirror needs to compare: ids missing locally are downloaded through
+/quotes?ids=..., a batch at a time, and ids the server no longer lists are
+dropped. The manifest's ETag and the local file's fingerprint (see
+quote._fingerprint) are kept next to the local copy, so polling an unchanged
+server costs a stat, one 304 and no parsing.
+"""
+import argparse
+import json
+import os
+import urllib.error
+import urllib.request
+
+import quote
+from quote import _quote
+
+BATCH = 500
+
+
+def _get(url: str, etag: str | None = None, timeout: float = 30) -> tuple[dict | None, str | None]:
+    """(JSON body, ETag) of a GET; the body is None on 304 Not Modified"""
+    request = urllib.request.Request(url, headers={"If-None-Match": etag} if etag else {})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.load(response), response.headers.get("ETag")
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return None, etag
+        raise
+
+
+def sync(base_url: str, json_path: str = "mirror_quotes.json") -> tuple[list[int], list[int]] | None:
+    """Bring the quotes in `json_path` up to date with the server at `base_url`.
+
+    Returns the (added, removed) ids, or None if the manifest has not changed
+    since the last sync.
+    """
+    base_url = base_url.rstrip("/")
+    meta_path = json_path + ".meta.json"
+    meta = quote._read_cache_meta(meta_path)
+    # Only send the saved ETag if the local file is still the one it was saved with
+    fresh = quote._fresh_fingerprint(json_path, meta.get("json"))
+    data, etag = _get(base_url + "/manifest", meta.get("etag") if fresh is not None else None)
+    if data is None:
+        if fresh != meta.get("json"):
+            quote._write_cache_meta(meta_path, {"etag": etag, "json": fresh})
+        return None
+
+    local = quote.QuoteStore(quote.load_quotes_from_json(json_path) if os.path.exists(json_path) else ())
+    ids = data["ids"]
+    added, removed = quote.diff_manifest(local.ids(), ids)
+    fetched: dict[int, _quote] = {}
+    for i in range(0, len(added), BATCH):
+        batch, _ = _get(base_url + "/quotes?ids=" + ",".join(map(str, added[i:i + BATCH])))
+        for row in batch["quotes"]:
+            fetched[row["id"]] = _quote.from_dict(row)
+    if added or removed or not os.path.exists(json_path):
+        quotes = [q for q in (fetched.get(id) or local.get(id) for id in ids) if q is not None]
+        quote.encode_quotes_to_json(json_path, quotes)
+    try:
+        quote._write_cache_meta(meta_path, {"etag": etag, "json": quote._fingerprint(json_path)})
+    except OSError as e:
+        print(f"Error recording the state of '{json_path}': {e}")
+    return added, removed
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Mirror a quote server's corpus")
+    parser.add_argument("url", help="base URL of the quote server")
+    parser.add_argument("--out", default="mirror_quotes.json", help="local JSON copy to update")
+    args = parser.parse_args(argv)
+    try:
+        result = sync(args.url, args.out)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error syncing from {args.url}: {e}")
+        return
+    if result is None:
+        print("Already up to date.")
+    else:
+        added, removed = result
+        print(f"{len(added)} quote(s) added, {len(removed)} removed; saved to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
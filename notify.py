@@ -0,0 +1,316 @@
+"""Desktop notification dispatch.
+
+Backends are probed once per process (which commands exist, which platform
+we are on, whether plyer imports) and the result is cached. Notifications
+are queued and delivered by a small pool of worker threads. Each send has a
+timeout, a failing send is retried on the next backend with exponential
+backoff. A backend that turns out to be unusable (e.g. plyer without a
+platform implementation) is skipped for the rest of the process; one that
+fails `max_failures` times in a row is skipped for `cooldown` seconds and
+then tried again.
+
+FakeBackend delivers nowhere after a configurable delay, so throughput can be
+measured headlessly:
+
+    d = Dispatcher([FakeBackend(latency=0.01)], workers=8)
+    for _ in range(1000):
+        d.submit("title", "message")
+    d.join()
+    print(d.metrics)
+"""
+from collections import Counter
+from concurrent.futures import Future
+import platform
+import queue
+import shutil
+import subprocess
+import threading
+import time
+
+import stats
+
+
+class BackendUnavailable(Exception):
+    """The backend cannot work on this machine; stop trying it"""
+
+
+class Backend:
+    name = "backend"
+
+    def available(self) -> bool:
+        return True
+
+    def send(self, title: str, subtitle: str, message: str, timeout: float) -> None:
+        raise NotImplementedError
+
+
+def _escape(text: str) -> str:
+    # Escape quotes for shell commands
+    return text.replace('"', '\\"').replace('`', '\\`')
+
+
+class TerminalNotifierBackend(Backend):
+    name = "terminal-notifier"
+
+    def available(self) -> bool:
+        return platform.system() == "Darwin" and shutil.which('terminal-notifier') is not None
+
+    def send(self, title, subtitle, message, timeout):
+        subprocess.run([
+            'terminal-notifier',
+            '-title', title,
+            '-subtitle', _escape(subtitle),
+            '-message', _escape(message),
+            '-sound', 'default',
+            '-timeout', '15'
+        ], check=True, capture_output=True, timeout=timeout)
+
+
+class AppleScriptBackend(Backend):
+    name = "osascript"
+
+    def available(self) -> bool:
+        return platform.system() == "Darwin" and shutil.which('osascript') is not None
+
+    def send(self, title, subtitle, message, timeout):
+        applescript = f'''
+        display notification "{_escape(message)}" with title "{title}" subtitle "{_escape(subtitle)}" sound name "default"
+        '''
+        subprocess.run(['osascript', '-e', applescript], check=True, capture_output=True, timeout=timeout)
+
+
+class PlyerBackend(Backend):
+    name = "plyer"
+
+    def __init__(self):
+        self._notification = None
+        self._pending: threading.Thread | None = None
+        # One plyer call at a time, whichever worker sends it
+        self._busy = threading.Lock()
+
+    def available(self) -> bool:
+        try:
+            from plyer import notification
+        except ImportError:
+            return False
+        self._notification = notification
+        return True
+
+    def send(self, title, subtitle, message, timeout):
+        # plyer calls the platform API in-process and can hang (e.g. a stuck
+        # Windows toast), so it runs in its own thread and we stop waiting
+        # after `timeout`; a hung call is left behind, not waited for again
+        deadline = time.monotonic() + timeout
+        if not self._busy.acquire(timeout=timeout):
+            raise TimeoutError(f"plyer was busy for {timeout} s")
+        try:
+            self._send(title, message, deadline - time.monotonic())
+        finally:
+            self._busy.release()
+
+    def _send(self, title, message, timeout):
+        if self._pending is not None and self._pending.is_alive():
+            raise TimeoutError("an earlier plyer notification has not returned")
+        errors: list[BaseException] = []
+
+        def notify():
+            try:
+                self._notification.notify(
+                    title=title,
+                    message=message,
+                    timeout=15,
+                    app_name="Quote App",
+                    toast=platform.system() == "Windows"
+                )
+            except Exception as e:
+                errors.append(e)
+
+        thread = self._pending = threading.Thread(target=notify, name="plyer-notify", daemon=True)
+        thread.start()
+        thread.join(max(timeout, 0))
+        if thread.is_alive():
+            raise TimeoutError(f"plyer did not return within {timeout:.1f} s")
+        if errors:
+            if isinstance(errors[0], NotImplementedError):
+                raise BackendUnavailable(str(errors[0]))
+            raise errors[0]
+
+
+class NotifySendBackend(Backend):
+    name = "notify-send"
+
+    def available(self) -> bool:
+        return shutil.which('notify-send') is not None
+
+    def send(self, title, subtitle, message, timeout):
+        subprocess.run([
+            'notify-send',
+            title,
+            f'{message}\n\n— {subtitle}',
+            '-t', '15000',  # 15 seconds
+            '-i', 'dialog-information'
+        ], check=True, capture_output=True, timeout=timeout)
+
+
+class PrintBackend(Backend):
+    """Ultimate fallback - just print"""
+    name = "print"
+
+    def send(self, title, subtitle, message, timeout):
+        print(f"🔔 {title} (Fallback):")
+        print(f"📖 {message}")
+        print(f"📍 {subtitle}")
+
+
+class FakeBackend(Backend):
+    """Delivers nowhere after `latency` seconds; fails every `fail_every`-th send"""
+    name = "fake"
+
+    def __init__(self, latency: float = 0.0, fail_every: int = 0):
+        self.latency = latency
+        self.fail_every = fail_every
+        self.sent = 0
+        self._calls = 0
+        self._lock = threading.Lock()
+
+    def send(self, title, subtitle, message, timeout):
+        with self._lock:
+            self._calls += 1
+            fail = self.fail_every and self._calls % self.fail_every == 0
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            raise RuntimeError("fake failure")
+        with self._lock:
+            self.sent += 1
+
+
+_probed: list[Backend] | None = None
+_probe_lock = threading.Lock()
+
+
+def probe_backends() -> list[Backend]:
+    """Usable backends for this machine in order of preference, probed once"""
+    global _probed
+    with _probe_lock:
+        if _probed is None:
+            system = platform.system()
+            if system == "Darwin":
+                candidates = [TerminalNotifierBackend(), AppleScriptBackend()]
+            elif system == "Windows":
+                candidates = [PlyerBackend()]
+            else:  # Linux and other Unix-like systems
+                candidates = [PlyerBackend(), NotifySendBackend()]
+            _probed = [b for b in candidates if b.available()] + [PrintBackend()]
+        return list(_probed)
+
+
+class Dispatcher:
+    def __init__(self, backends: list[Backend] | None = None, workers: int = 2,
+                 timeout: float = 10.0, retries: int = 2, backoff: float = 0.5,
+                 max_queue: int = 10000, max_failures: int = 3, cooldown: float = 300.0):
+        self.backends = backends if backends is not None else probe_backends()
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self.metrics: Counter = Counter()
+        self.latency_total = 0.0
+        self._disabled: dict[str, float] = {}  # backend -> monotonic time it may be tried again
+        self._failures: Counter = Counter()  # consecutive failures per backend
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._workers = [threading.Thread(target=self._work, name=f"notify-{i}", daemon=True)
+                         for i in range(workers)]
+        for w in self._workers:
+            w.start()
+
+    def submit(self, title: str, message: str, subtitle: str = "") -> Future:
+        """Queue a notification; the future resolves to the backend name that delivered it"""
+        fut: Future = Future()
+        self._queue.put((title, subtitle, message, fut, time.perf_counter()))
+        with self._lock:
+            self.metrics["queued"] += 1
+        return fut
+
+    def join(self) -> None:
+        """Wait until everything queued so far has been handled"""
+        self._queue.join()
+
+    def _deliver(self, title: str, subtitle: str, message: str) -> str:
+        attempt = 0
+        while True:
+            for backend in self.backends:
+                if backend.name in self._disabled and time.monotonic() < self._disabled[backend.name]:
+                    continue
+                try:
+                    with stats.timer("notify_send", backend=backend.name):
+                        backend.send(title, subtitle, message, self.timeout)
+                    if self._failures:
+                        with self._lock:
+                            self._failures.pop(backend.name, None)
+                    return backend.name
+                except BackendUnavailable:
+                    self._disable(backend.name, permanent=True)
+                except Exception:
+                    with self._lock:
+                        self.metrics[f"failed.{backend.name}"] += 1
+                        self._failures[backend.name] += 1
+                        give_up = self._failures[backend.name] >= self.max_failures
+                    stats.incr("notify_failures", backend=backend.name)
+                    if give_up:
+                        self._disable(backend.name)
+            if attempt >= self.retries:
+                raise RuntimeError("no notification backend succeeded")
+            with self._lock:
+                self.metrics["retries"] += 1
+            time.sleep(self.backoff * (2 ** attempt))
+            attempt += 1
+
+    def _disable(self, name: str, permanent: bool = False) -> None:
+        """Skip a backend for `cooldown` seconds, or for good if it cannot work here.
+
+        Its failure count is kept, so after the cooldown one more failure
+        disables it again; a success resets it.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now < self._disabled.get(name, now):
+                return
+            self._disabled[name] = float("inf") if permanent else now + self.cooldown
+            self.metrics[f"disabled.{name}"] += 1
+        stats.incr("notify_disabled", backend=name)
+
+    def _work(self) -> None:
+        while True:
+            title, subtitle, message, fut, queued_at = self._queue.get()
+            try:
+                name = self._deliver(title, subtitle, message)
+            except Exception as e:
+                with self._lock:
+                    self.metrics["failed"] += 1
+                fut.set_exception(e)
+            else:
+                latency = time.perf_counter() - queued_at
+                with self._lock:
+                    self.metrics["delivered"] += 1
+                    self.metrics[f"delivered.{name}"] += 1
+                    self.latency_total += latency
+                stats.observe("notify_delivery", latency, backend=name)
+                fut.set_result(name)
+            finally:
+                self._queue.task_done()
+
+
+_dispatcher: Dispatcher | None = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher() -> Dispatcher:
+    """Process-wide dispatcher over the probed backends"""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = Dispatcher()
+        return _dispatcher
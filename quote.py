@@ -1,6 +1,18 @@
-from dataclasses import dataclass
-from datetime import datetime
+from array import array
 import json
+from json.encoder import encode_basestring_ascii as _json_str
+import mmap
+import operator
+import os
+import struct
+import sys
+from functools import lru_cache
+from collections.abc import Callable, Iterable, Iterator
+
+try:
+    from . import stats
+except ImportError:
+    import stats
 
 _months = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
 _months_to_numbers = {
@@ -12,8 +24,6 @@ _numbers_to_months = {
     7: "Jul", 8: "Aug", 9: "Sep", 10: "Oct", 11: "Nov", 12: "Dec"
 }
 
-_id = 0
-
 def _string_to_tuple_manual(s: str) -> tuple:
     """Manual parsing by stripping parentheses and splitting"""
     # Remove parentheses and strip whitespace
@@ -34,105 +44,676 @@ def _string_to_tuple_manual(s: str) -> tuple:
 
 _origin = "Jordi A. Navarrette"
 
+_here = os.path.dirname(os.path.abspath(__file__))
+_source_file = os.path.join(_here, "Jordi's Famous quotes.txt")
+_json_file = os.path.join(_here, "quotes.json")
+_cache_file = os.path.join(_here, ".quotes_cache.json")
+_snapshot_file = os.path.join(_here, "quotes.snapshot")
+# Bumped when cached quotes from older versions must not be reused (2: stable ids, 3: appendable snapshot)
+CACHE_FORMAT = 3
+
+@lru_cache(maxsize=4096)
+def _format_date(date: tuple) -> str:
+    """Date part of str(quote), memoized since a corpus only has a few hundred distinct dates"""
+    year = date[0]
+    month = date[1]
+    day = date[2]
+    
+    # Handle None values
+    if year is None and month is None and day is None:
+        return 'n.d.'
+    elif year is not None and month is None and day is None:
+        # Only year is specified
+        return str(year)
+    elif year is not None and month is not None and day is None:
+        # Year and month are specified
+        return f"{_numbers_to_months[month]}, {year}"
+    elif year is not None and month is not None and day is not None:
+        # Full date is specified
+        month_name = _numbers_to_months[month]
+        return f"{month_name} {day}, {year}"
+    elif year is not None and month is None and day is not None:
+        # Year and day are specified (unusual case)
+        return f"{year}"
+    else:
+        # Fallback for any other combination
+        return "n.d."
+
 class _quote:      
+    __slots__ = ("content", "date", "origin", "id")
                                                 # year, month,       day
     def __init__(self, content: str, date: tuple[int, int | None, int | None] | tuple[int] | None = None, origin: str = _origin):
-        global _id
         self.content = content
-        self.date: tuple[int | None, int | None, int | None] = date if date is not None and len(date) == 3 else (0, None, None)
+        self.date: tuple[int | None, int | None, int | None] = tuple(date) if date is not None and len(date) == 3 else (0, None, None) # type: ignore
         self.origin = origin
-        self.id = _id
-        _id += 1
+        self.id = stable_id(content, self.date)
+
+    @classmethod
+    def _make(cls, content: str, date: tuple, origin: str, id: int) -> '_quote':
+        """Build a _quote with a known id, without hashing its content"""
+        quote = cls.__new__(cls)
+        quote.content = content
+        quote.date = date
+        quote.origin = origin
+        quote.id = id
+        return quote
 
     def __str__(self) -> str:
-        year = self.date[0]
-        month = self.date[1]
-        day = self.date[2]
-        
-        # Handle None values
-        if year is None and month is None and day is None:
-            datestr = 'n.d.'
-        elif year is not None and month is None and day is None:
-            # Only year is specified
-            datestr = str(year)
-        elif year is not None and month is not None and day is None:
-            # Year and month are specified
-            datestr = f"{_numbers_to_months[month]}, {year}"
-        elif year is not None and month is not None and day is not None:
-            # Full date is specified
-            month_name = _numbers_to_months[month]
-            datestr = f"{month_name} {day}, {year}"
-        elif year is not None and month is None and day is not None:
-            # Year and day are specified (unusual case)
-            datestr = f"{year}"
-        else:
-            # Fallback for any other combination
-            datestr = "n.d."
-            
-        return f'{self.content} -- {self.origin}, {datestr}'
+        return f'{self.content} -- {self.origin}, {_format_date(self.date)}'
 
-    def encode(self) -> str:
-        """Convert the _quote object to a JSON string"""
-        quote_dict = {
+    def to_dict(self) -> dict:
+        return {
             'content': self.content,
             'date': self.date,
             'origin': self.origin,
             'id': self.id
         }
-        return json.dumps(quote_dict)
 
     @classmethod
-    def decode(cls, json_str: str) -> '_quote':
-        """Create a _quote object from a JSON string"""
-        data = json.loads(json_str)
-        
+    def from_dict(cls, data: dict) -> '_quote':
+        """Create a _quote object from an already-parsed JSON object"""
         # Convert date list back to tuple
         date_data = data.get('date', (0, None, None))
-        if isinstance(date_data, list):
-            date_data = tuple(date_data)
-        
-        # Create new _quote instance
-        quote = cls(
-            content=data['content'],
-            date=date_data,
-            origin=data.get('origin', 'Unknown')
-        )
-        
-        # Restore the original ID
-        quote.id = data['id']
-        
-        return quote
+        date_data = tuple(date_data) if date_data is not None and len(date_data) == 3 else (0, None, None)
+        return cls._make(data['content'], date_data, data.get('origin', 'Unknown'), data['id'])
 
-def extract(filename: str = "./Jordi's Famous Quotes.txt", 
-            start_year=2022, start_month=None, start_day=None) -> list[_quote]:
-    quotes = f"[Extraction Error / File not loaded: {filename}]"
-    with open(filename, 'r', encoding='utf-8') as f:
-        quotes = f.read()
-    lines = quotes.split("\n")
-    for i in range(len(lines)):
-        lines[i] = lines[i].strip()
-    quotelist: list[_quote] = []
-    year = start_year
-    month = start_month
-    day = start_day
-    # print(f"Raw quotes: {quotes}")
-    for q in quotes.split("\n\n"):
+    def encode(self) -> str:
+        """Convert the _quote object to a JSON string"""
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def decode(cls, json_str: str) -> '_quote':
+        """Create a _quote object from a JSON string"""
+        return cls.from_dict(json.loads(json_str))
+
+def pack_date(date: tuple) -> int:
+    """Pack a (year, month|None, day|None) tuple into one sortable int.
+
+    The result is year * 10000 + month * 100 + day, with a missing month or day
+    stored as 0 and a missing year as -1, e.g. (2025, 11, 17) -> 20251117.
+    """
+    year, month, day = date
+    return (-1 if year is None else year) * 10000 + (month or 0) * 100 + (day or 0)
+
+def unpack_date(key: int) -> tuple[int | None, int | None, int | None]:
+    """Inverse of pack_date"""
+    year, rest = divmod(key, 10000)
+    month, day = divmod(rest, 100)
+    return (None if year == -1 else year, month or None, day or None)
+
+# hashlib.blake2b, imported on first use since hashlib is slow to import
+_blake2b = None
+
+def stable_id(content: str, date: tuple, occurrence: int = 0) -> int:
+    """Content-addressed quote id: 53 bits of a BLAKE2b hash of the date and content.
+
+    The same quote gets the same id in every process and on every machine,
+    no matter where it sits in the file. `occurrence` tells apart exact
+    repeats (same content, same date): the n-th one hashes with n. Ids fit a
+    double, so they survive JSON in any language.
+    """
+    global _blake2b
+    if _blake2b is None:
+        from hashlib import blake2b as _blake2b
+    key = f"{pack_date(date)}\0{occurrence}\0{content}" if occurrence else f"{pack_date(date)}\0{content}"
+    return int.from_bytes(_blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little') >> 11
+
+def _unique_id(content: str, date: tuple, taken: Callable[[int], bool]) -> int:
+    """stable_id() of the first occurrence for which `taken(id)` is false"""
+    occurrence = 0
+    id = stable_id(content, date)
+    while taken(id):
+        occurrence += 1
+        id = stable_id(content, date, occurrence)
+    return id
+
+def _build_id_table(ids) -> array:
+    """Open-addressing hash table over `ids`, at most half full.
+
+    Slot id & mask (then the next ones, linearly) holds the position + 1 of
+    the quote with that id; 0 marks an empty slot. Positions are checked
+    against the id column on lookup, so the table itself stores no ids.
+    """
+    mask = (1 << max(3, (2 * len(ids)).bit_length())) - 1
+    table = array('I', bytes(4 * (mask + 1)))
+    for pos, id in enumerate(ids, 1):
+        slot = id & mask
+        while table[slot]:
+            slot = (slot + 1) & mask
+        table[slot] = pos
+    return table
+
+def _table_remove(table: array, ids, pos: int) -> None:
+    """Remove position `pos` (1-based, as stored) from an id table made by _build_id_table.
+
+    Later entries of the probe run are shifted back into the hole so every
+    remaining id stays reachable from its home slot.
+    """
+    mask = len(table) - 1
+    hole = ids[pos - 1] & mask
+    while table[hole] != pos:
+        hole = (hole + 1) & mask
+    slot = hole
+    while True:
+        slot = (slot + 1) & mask
+        moved = table[slot]
+        if not moved:
+            break
+        # Only entries whose home slot is not between the hole and here may move into it
+        if (slot - ids[moved - 1]) & mask >= (slot - hole) & mask:
+            table[hole] = moved
+            hole = slot
+    table[hole] = 0
+
+def manifest(quotes) -> list[int]:
+    """Ids of `quotes` in corpus order"""
+    ids = getattr(quotes, "ids", None)
+    return list(ids()) if ids is not None else [q.id for q in quotes]
+
+def diff_manifest(old: Iterable[int], new: Iterable[int]) -> tuple[list[int], list[int]]:
+    """(added, removed) ids between two manifests, each in its manifest's order"""
+    old = list(old)
+    new = list(new)
+    old_set, new_set = set(old), set(new)
+    return [i for i in new if i not in old_set], [i for i in old if i not in new_set]
+
+class QuoteStore:
+    """Column-oriented container for quotes.
+
+    Dates are kept as packed ints in an array, origins as small integer codes
+    into an interned table, and all content in one UTF-8 buffer addressed by
+    offsets. Indexing returns a fresh _quote built from the columns, so
+    `store[i].content/.date/.origin/.id` work exactly like on a list of quotes.
+    `store.get(id)` looks a quote up by id through a hash table over the id
+    column, built on first use.
+    """
+
+    def __init__(self, quotes: Iterable[_quote] = ()):
+        self._ids = array('q')
+        self._dates = array('i')
+        self._origin_codes = array('H')
+        self._offsets = array('Q', [0])
+        self._content = bytearray()
+        self.origins: list[str] = []
+        self._origin_index: dict[str, int] = {}
+        self._id_table: array | None = None
+        # Bumped whenever existing entries change (appending does not)
+        self.version = 0
+        self.extend(quotes)
+
+    @classmethod
+    def from_quotes(cls, quotes: Iterable[_quote]) -> 'QuoteStore':
+        return cls(quotes)
+
+    @classmethod
+    def from_snapshot(cls, mapped: 'MappedQuoteStore') -> 'QuoteStore':
+        """Copy a mapped snapshot into memory, column by column rather than quote by quote"""
+        store = cls()
+        n = len(mapped)
+        mm = mapped._mm
+        records = mm[mapped._records_offset:mapped._records_offset + n * _snapshot_record.size]
+        store._ids, store._dates, store._origin_codes, offsets, lengths = (
+            _unpack_column(records, start, typecode) for start, typecode in _record_columns)
+        end = offsets[-1] + lengths[-1] if n else 0
+        offsets.append(end)
+        store._offsets = offsets
+        store._content = bytearray(mm[mapped._content_offset:mapped._content_offset + end])
+        store.origins = list(mapped.origins)
+        store._origin_index = {o: i for i, o in enumerate(store.origins)}
+        table = array('I', mm[mapped._ids_offset:mapped._ids_offset + 4 * mapped._id_slots])
+        if sys.byteorder != "little":
+            table.byteswap()
+        store._id_table = table
+        return store
+
+    def _origin_code(self, origin: str) -> int:
+        code = self._origin_index.get(origin)
+        if code is None:
+            code = len(self.origins)
+            self.origins.append(sys.intern(origin))
+            self._origin_index[origin] = code
+        return code
+
+    def add(self, content: str, date: tuple, origin: str = _origin, id: int | None = None) -> int:
+        """Append one quote from its fields and return its index.
+
+        Without an id the quote gets its stable_id(), counting earlier exact
+        repeats already in the store.
+        """
+        if id is None:
+            id = stable_id(content, date)
+            if self.find(id) >= 0:
+                id = _unique_id(content, date, lambda i: self.find(i) >= 0)
+        index = len(self._ids)
+        self._ids.append(id)
+        self._dates.append(pack_date(date))
+        self._origin_codes.append(self._origin_code(origin))
+        self._content += content.encode('utf-8')
+        self._offsets.append(len(self._content))
+        table = self._id_table
+        if table is not None:
+            if 2 * len(self._ids) >= len(table):
+                self._id_table = None
+            else:
+                mask = len(table) - 1
+                slot = id & mask
+                while table[slot]:
+                    slot = (slot + 1) & mask
+                table[slot] = index + 1
+        return index
+
+    def append(self, quote: _quote) -> None:
+        self.add(quote.content, quote.date, quote.origin, quote.id)
+
+    def extend(self, quotes: Iterable[_quote]) -> None:
+        for q in quotes:
+            self.add(q.content, q.date, q.origin, q.id)
+
+    def truncate(self, n: int) -> None:
+        """Drop every quote from index `n` on"""
+        if n >= len(self._ids):
+            return
+        self.version += 1
+        table = self._id_table
+        if table is not None and len(self._ids) - n < n:
+            # Fewer entries to remove than to rebuild
+            for pos in range(n + 1, len(self._ids) + 1):
+                _table_remove(table, self._ids, pos)
+        else:
+            self._id_table = None
+        del self._ids[n:]
+        del self._dates[n:]
+        del self._origin_codes[n:]
+        del self._content[self._offsets[n]:]
+        del self._offsets[n + 1:]
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        n = len(self._ids)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("QuoteStore index out of range")
+        return _quote._make(self.content(index), unpack_date(self._dates[index]),
+                            self.origins[self._origin_codes[index]], self._ids[index])
+
+    def __iter__(self) -> Iterator[_quote]:
+        for i in range(len(self._ids)):
+            yield self[i]
+
+    def content(self, index: int) -> str:
+        """Content of one quote, without building the whole _quote"""
+        return self._content[self._offsets[index]:self._offsets[index + 1]].decode('utf-8')
+
+    def date_key(self, index: int) -> int:
+        """Packed date of one quote (see pack_date)"""
+        return self._dates[index]
+
+    def ids(self) -> array:
+        return self._ids
+
+    def _table(self) -> array:
+        if self._id_table is None:
+            self._id_table = _build_id_table(self._ids)
+        return self._id_table
+
+    def find(self, id: int) -> int:
+        """Index of the quote with this id, or -1"""
+        table = self._table()
+        mask = len(table) - 1
+        slot = id & mask
+        ids = self._ids
+        while True:
+            pos = table[slot]
+            if not pos:
+                return -1
+            if ids[pos - 1] == id:
+                return pos - 1
+            slot = (slot + 1) & mask
+
+    def get(self, id: int, default=None):
+        """The quote with this id, or `default`"""
+        index = self.find(id)
+        return self[index] if index >= 0 else default
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns, in bytes"""
+        return (sys.getsizeof(self._ids) + sys.getsizeof(self._dates)
+                + sys.getsizeof(self._origin_codes) + sys.getsizeof(self._offsets)
+                + sys.getsizeof(self._content) + sum(sys.getsizeof(o) for o in self.origins)
+                + (sys.getsizeof(self._id_table) if self._id_table is not None else 0))
+
+# Binary snapshot layout (all little-endian):
+#   header:  magic, version, record count, origins table offset, content offset,
+#            id table offset, id table slot count, records offset
+#   content: UTF-8 blob, record offsets are relative to its start
+#   records: count fixed-width rows of (id, packed date, origin code, content offset, content length)
+#   ids:     u32 slots of the id hash table (see _build_id_table)
+#   origins: u32 count, then (u32 length, UTF-8 bytes) per origin
+# The snapshot is always written to a new file and moved into place: readers
+# may have the old one memory-mapped, and must keep seeing it unchanged.
+SNAPSHOT_MAGIC = b"JQSNAP\0\0"
+SNAPSHOT_VERSION = 3
+_snapshot_header = struct.Struct("<8sIIQQQQQ")
+_snapshot_record = struct.Struct("<qiHxxQI")
+_snapshot_slot = struct.Struct("<I")
+# Byte offset and array typecode of each record field: id, date, origin, content offset, length
+_record_columns = ((0, 'q'), (8, 'i'), (12, 'H'), (16, 'Q'), (24, 'I'))
+
+def _unpack_column(records: bytes, start: int, typecode: str) -> array:
+    """One field of every record, gathered with strided slices instead of per-record unpacking"""
+    size = _snapshot_record.size
+    column = array(typecode)
+    width = column.itemsize
+    data = bytearray(len(records) // size * width)
+    for k in range(width):
+        data[k::width] = records[start + k::size]
+    column.frombytes(data)
+    if sys.byteorder != "little":
+        column.byteswap()
+    return column
+
+def _pack_records(quotes: 'QuoteStore') -> bytearray:
+    """The record rows of a snapshot of `quotes`, interleaved from its columns"""
+    size = _snapshot_record.size
+    n = len(quotes)
+    offsets = quotes._offsets
+    columns = (quotes._ids, quotes._dates, quotes._origin_codes, offsets[:n],
+               array('I', map(operator.sub, offsets[1:], offsets)))
+    records = bytearray(n * size)
+    for (start, _), column in zip(_record_columns, columns):
+        if sys.byteorder != "little":
+            column = array(column.typecode, column)
+            column.byteswap()
+        data = column.tobytes()
+        width = column.itemsize
+        for k in range(width):
+            records[start + k::size] = data[k::width]
+    return records
+
+def _write_snapshot_tables(f, quotes: 'QuoteStore') -> None:
+    """Write records, id table and origins after the content, then the header"""
+    content_offset = _snapshot_header.size
+    records_offset = content_offset + len(quotes._content)
+    f.seek(records_offset)
+    f.write(_pack_records(quotes))
+    table = quotes._table()
+    if sys.byteorder != "little":
+        table = array('I', table)
+        table.byteswap()
+    ids_offset = records_offset + len(quotes) * _snapshot_record.size
+    f.write(table)
+    origins = b"".join(struct.pack("<I", len(o.encode('utf-8'))) + o.encode('utf-8') for o in quotes.origins)
+    f.write(struct.pack("<I", len(quotes.origins)) + origins)
+    f.truncate()
+    f.seek(0)
+    f.write(_snapshot_header.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(quotes), ids_offset + 4 * len(table),
+                                  content_offset, ids_offset, len(table), records_offset))
+
+def write_snapshot(file_path: str, quotes: 'QuoteStore | Iterable[_quote]') -> None:
+    """Write quotes to a binary snapshot that MappedQuoteStore can open"""
+    if not isinstance(quotes, QuoteStore):
+        quotes = QuoteStore(quotes)
+    tmp_path = file_path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.seek(_snapshot_header.size)
+        f.write(quotes._content)
+        _write_snapshot_tables(f, quotes)
+    os.replace(tmp_path, file_path)
+
+class MappedQuoteStore:
+    """Read-only QuoteStore backed by a memory-mapped snapshot file.
+
+    Opening only reads the header and the origins table; `store[i]` unpacks
+    one record and decodes only that quote's content, and `store.get(id)`
+    probes the id table saved in the snapshot, so neither touches the rest.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        with open(file_path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, self._count, origins_offset, self._content_offset, \
+                self._ids_offset, self._id_slots, self._records_offset = _snapshot_header.unpack_from(self._mm, 0)
+        except struct.error:
+            self._mm.close()
+            raise ValueError(f"'{file_path}' is not a quote snapshot")
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            self._mm.close()
+            raise ValueError(f"'{file_path}' is not a version {SNAPSHOT_VERSION} quote snapshot")
+        (n_origins,) = struct.unpack_from("<I", self._mm, origins_offset)
+        pos = origins_offset + 4
+        self.origins: list[str] = []
+        for _ in range(n_origins):
+            (length,) = struct.unpack_from("<I", self._mm, pos)
+            self.origins.append(sys.intern(self._mm[pos + 4:pos + 4 + length].decode('utf-8')))
+            pos += 4 + length
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def _record(self, index: int) -> tuple[int, int, int, int, int]:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("MappedQuoteStore index out of range")
+        return _snapshot_record.unpack_from(self._mm, self._records_offset + index * _snapshot_record.size)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        id, date, origin, offset, length = self._record(index)
+        start = self._content_offset + offset
+        return _quote._make(self._mm[start:start + length].decode('utf-8'), unpack_date(date),
+                            self.origins[origin], id)
+
+    def __iter__(self) -> Iterator[_quote]:
+        for i in range(self._count):
+            yield self[i]
+
+    def content(self, index: int) -> str:
+        _, _, _, offset, length = self._record(index)
+        start = self._content_offset + offset
+        return self._mm[start:start + length].decode('utf-8')
+
+    def date_key(self, index: int) -> int:
+        return self._record(index)[1]
+
+    def ids(self) -> list[int]:
+        records = self._mm[self._records_offset:self._records_offset + self._count * _snapshot_record.size]
+        return [r[0] for r in _snapshot_record.iter_unpack(records)]
+
+    def find(self, id: int) -> int:
+        """Index of the quote with this id, or -1"""
+        mask = self._id_slots - 1
+        slot = id & mask
+        mm = self._mm
+        while True:
+            (pos,) = _snapshot_slot.unpack_from(mm, self._ids_offset + 4 * slot)
+            if not pos:
+                return -1
+            if _snapshot_record.unpack_from(mm, self._records_offset + (pos - 1) * _snapshot_record.size)[0] == id:
+                return pos - 1
+            slot = (slot + 1) & mask
+
+    def get(self, id: int, default=None):
+        """The quote with this id, or `default`"""
+        index = self.find(id)
+        return self[index] if index >= 0 else default
+
+def _iter_blocks(f, chunk_size: int = 1 << 16) -> Iterator[str]:
+    """Yield the "\n\n"-separated blocks of a text file, reading `chunk_size`
+    characters at a time. Gives the same pieces as f.read().split("\n\n")."""
+    buf = ""
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        buf += chunk
+        parts = buf.split("\n\n")
+        buf = parts.pop()
+        yield from parts
+    yield buf
+
+class _Parser:
+    """Year/month/day header state carried from block to block"""
+    __slots__ = ("year", "month", "day")
+
+    def __init__(self, year=2022, month=None, day=None):
+        self.year = year
+        self.month = month
+        self.day = day
+
+    def feed(self, q: str) -> tuple[int, int | None, int | None] | None:
+        """Consume one block; return the quote's date if the block is a quote"""
         if q.startswith("20"):
-            year = int(q)
-            month = "Jan" if month is not None else None
-            day = 1
+            self.year = int(q)
+            self.month = "Jan" if self.month is not None else None
+            self.day = 1
         if any(q.startswith(k) for k in _months):
-            month = q[0:3]
-            day = int(q[4:6])
+            self.month = q[0:3]
+            self.day = int(q[4:6])
         if any(q.startswith(k) for k in ("S: ", "'", '"', "[")):
-            quotelist.append(_quote(q, (year, _months_to_numbers.get(month, None), day))) # type: ignore
-            
-            # testing __str__ doesn't produce error
-            quotelist[-1].__str__()
-        # print(f"Year: {year}, Month: {month}, Day: {day}")
+            return (self.year, _months_to_numbers.get(self.month, None), self.day) # type: ignore
+        # print(f"Year: {self.year}, Month: {self.month}, Day: {self.day}")
+        return None
+
+def _parse_blocks(blocks: Iterable[str], start_year=2022, start_month=None, start_day=None) -> Iterator[_quote]:
+    """Turn raw blocks into _quote objects, tracking the year/month/day headers"""
+    parser = _Parser(start_year, start_month, start_day)
+    # Exact repeats share a date, so only the current day's ids are kept: memory
+    # stays flat, and repeats are told apart as long as each day's quotes are
+    # together in the file (one header per day), which is how it is written
+    taken: set[int] = set()
+    day = None
+    for q in blocks:
+        date = parser.feed(q)
+        if date is not None:
+            if date != day:
+                taken.clear()
+                day = date
+            id = _unique_id(q, date, taken.__contains__)
+            taken.add(id)
+            yield _quote._make(q, date, _origin, id)
+
+def iter_extract(filename: str = _source_file,
+                 start_year=2022, start_month=None, start_day=None,
+                 chunk_size: int = 1 << 16) -> Iterator[_quote]:
+    """Stream quotes from the text file one at a time.
+
+    The file is read in chunks of `chunk_size` characters, so memory use is
+    bounded by the largest single block rather than by the file size.
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        yield from _parse_blocks(_iter_blocks(f, chunk_size), start_year, start_month, start_day)
+
+@stats.timed("extract")
+def extract(filename: str = _source_file, 
+            start_year=2022, start_month=None, start_day=None,
+            dedupe: str | None = None) -> list[_quote]:
+    """Parse the whole file; dedupe="merge"/"drop" folds near-duplicates (see dedup.py)
+
+    Any dedupe mode, "keep" included, prints how many clusters it found and
+    counts them in the dedup_clusters stat.
+    """
+    quotelist: list[_quote] = []
+    for q in iter_extract(filename, start_year, start_month, start_day):
+        # testing __str__ doesn't produce error
+        q.__str__()
+        quotelist.append(q)
+    if dedupe is not None:
+        import dedup
+        quotelist, clusters = dedup.dedupe(quotelist, dedupe)
+        stats.incr("dedup_clusters", len(clusters), mode=dedupe)
+        if clusters:
+            print(f"{len(clusters)} near-duplicate cluster(s) ({sum(len(c) - 1 for c in clusters)} redundant, "
+                  f"mode {dedupe}); `python dedup.py` lists them")
     return quotelist
     
 
+def _parse_chunk(blocks: list[str], start_year=2022, start_month=None, start_day=None) -> tuple[list[tuple], int, bool]:
+    """Worker for extract_parallel: parse one run of blocks.
+
+    Returns the (content, date, stable id) triples, how many of them came
+    before the chunk's first month header, and whether a month header was
+    seen. Repeats are left for the merge to number.
+    """
+    parser = _Parser(start_year, start_month, start_day)
+    out: list[tuple] = []
+    before_month = -1
+    for q in blocks:
+        if before_month < 0 and any(q.startswith(k) for k in _months):
+            before_month = len(out)
+        date = parser.feed(q)
+        if date is not None:
+            out.append((q, date, stable_id(q, date)))
+    return out, (len(out) if before_month < 0 else before_month), before_month >= 0
+
+@stats.timed("extract_parallel")
+def extract_parallel(filename: str = _source_file,
+                     start_year=2022, start_month=None, start_day=None,
+                     workers: int | None = None, chunks_per_worker: int = 4) -> list[_quote]:
+    """Same result as extract(), with the blocks parsed in worker processes.
+
+    The file is cut at year headers, so every chunk but the first starts
+    from a known year and day. The one piece of state that crosses a year
+    header is whether any month header came before it (the header then
+    resets the month to January instead of leaving it unknown); chunks are
+    parsed assuming it did not, and the merge fixes up the quotes before each
+    chunk's first month header once the earlier chunks are known.
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        blocks = f.read().split("\n\n")
+    workers = workers or os.cpu_count() or 1
+    starts = [i for i, q in enumerate(blocks) if q.startswith("20")]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    # Merge year sections into about `workers * chunks_per_worker` similar-sized chunks
+    target = max(1, len(blocks) // (workers * chunks_per_worker))
+    bounds = [0]
+    for i in starts[1:]:
+        if i - bounds[-1] >= target:
+            bounds.append(i)
+    bounds.append(len(blocks))
+    chunks = [blocks[a:b] for a, b in zip(bounds, bounds[1:])]
+
+    if workers == 1 or len(chunks) == 1:
+        results = [_parse_chunk(c, start_year, start_month, start_day) for c in chunks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_parse_chunk, chunks[0], start_year, start_month, start_day)]
+            futures += [pool.submit(_parse_chunk, c) for c in chunks[1:]]
+            results = [fut.result() for fut in futures]
+
+    quotelist: list[_quote] = []
+    # Same numbering of exact repeats as _parse_blocks: per day, in file order
+    taken: set[int] = set()
+    day = None
+    month_seen = start_month is not None
+    for n, (triples, before_month, saw_month) in enumerate(results):
+        for j, (content, date, id) in enumerate(triples):
+            if n and month_seen and j < before_month:
+                date = (date[0], 1, date[2])
+                id = stable_id(content, date)
+            if date != day:
+                taken.clear()
+                day = date
+            if id in taken:
+                id = _unique_id(content, date, taken.__contains__)
+            taken.add(id)
+            quotelist.append(_quote._make(content, date, _origin, id))
+        month_seen = month_seen or saw_month
+    return quotelist
+
 def test():
     q1 = _quote("Test with full tuple", (2025, 9, 1))
     q2 = _quote("Test with empty tuple", (2023, None, None))
@@ -141,6 +722,7 @@ def test():
     print(q2)
     print(q3)
 
+@stats.timed("json_load")
 def load_quotes_from_json(file_path: str) -> list['_quote']:
     """Load a list of _quote objects from a JSON file.
     
@@ -154,16 +736,11 @@ def load_quotes_from_json(file_path: str) -> list['_quote']:
         with open(file_path, 'r', encoding='utf-8') as file:
             data = json.load(file)
         
-        quotes = []
         # Check if the JSON has the expected structure
         if 'quotes' in data and isinstance(data['quotes'], list):
-            for quote_data in data['quotes']:
-                # Convert the quote dict to JSON string for decoding
-                json_str = json.dumps(quote_data)
-                quote = _quote.decode(json_str)
-                quotes.append(quote)
-        
-        return quotes
+            from_dict = _quote.from_dict
+            return [from_dict(quote_data) for quote_data in data['quotes']]
+        return []
         
     except FileNotFoundError:
         print(f"Error: File '{file_path}' not found.")
@@ -175,28 +752,412 @@ def load_quotes_from_json(file_path: str) -> list['_quote']:
         print(f"Error loading quotes: {e}")
         return []
 
-quote_list = []
+def _json_rows(quotes: Iterable[_quote]) -> Iterator[str]:
+    """Serialize quotes to JSON object strings, one per quote.
 
-def encode_quotes_to_json(file_path: str) -> None:
+    Produces the same text as json.dumps(q.to_dict()) but formats the fixed
+    fields directly and encodes each distinct origin only once.
+    """
+    origins: dict[str, str] = {}
+    for q in quotes:
+        origin = origins.get(q.origin)
+        if origin is None:
+            origin = origins[q.origin] = _json_str(q.origin)
+        year, month, day = q.date
+        yield (f'{{"content": {_json_str(q.content)}, "date": ['
+               f'{"null" if year is None else year}, {"null" if month is None else month}, '
+               f'{"null" if day is None else day}], "origin": {origin}, "id": {q.id}}}')
+
+@stats.timed("json_encode")
+def encode_quotes_to_json(file_path: str, quotes: 'Iterable[_quote] | None' = None) -> None:
+    """Write quotes (default: the loaded quote_list) to a JSON file.
+
+    Rows are streamed through one buffered writer in a single pass. The file
+    is written to a temporary path first and then moved into place, so a
+    reader never sees a half-written quotes.json.
+    """
+    quote_list = quotes if quotes is not None else get_quote_list()
+    tmp_path = file_path + ".tmp"
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
+        with open(tmp_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
             f.write('{"quotes": [\n')
-            for i, q in enumerate(quote_list):
-                tmp = ""
-                if i != len(quote_list) - 1:
-                    tmp = ","
-                f.write("\t" + q.encode() + tmp + "\n")
-                # print(q)
-            f.write("\n]}")
+            first = True
+            for row in _json_rows(quote_list):
+                f.write("\t" + row if first else ",\n\t" + row)
+                first = False
+            f.write("\n\n]}" if not first else "\n]}")
+        os.replace(tmp_path, file_path)
     except FileNotFoundError:
         print(f"Error: File '{file_path}' not found.")
     except Exception as e:
         print(f"Error loading quotes: {e}")
 
+def _append_json(file_path: str, quotes: 'QuoteStore', keep: int, count: int) -> bool:
+    """Write `quotes` to a quotes.json that holds `count` quotes, the first `keep` of them unchanged.
 
-quote_list = extract()
-    
-loaded_quote_list = load_quotes_from_json("./quotes.json")
-if loaded_quote_list == []:
-    print("JSON file will likely be loaded next time.")
-encode_quotes_to_json("./quotes.json")
\ No newline at end of file
+    encode_quotes_to_json writes one quote per line, so the end of the kept
+    rows is found by counting newlines back from the end of the file. Those
+    bytes are copied as they are and only the rows after them are encoded,
+    into a temporary file that then replaces the old one. Returns False if
+    the file does not look like that, leaving it to the caller to write the
+    whole file.
+    """
+    tmp_path = file_path + ".tmp"
+    try:
+        with open(file_path, 'rb') as f:
+            # The newline ending the kept rows, then one before each dropped row and one before "]}"
+            wanted = count - keep + 2
+            pos = f.seek(0, os.SEEK_END)
+            tail = b""
+            while tail.count(b"\n") <= wanted:
+                if pos == 0:
+                    return False
+                step = min(pos, 1 << 16)
+                pos -= step
+                f.seek(pos)
+                tail = f.read(step) + tail
+            cut = len(tail)
+            for _ in range(wanted):
+                cut = tail.rindex(b"\n", 0, cut)
+            # The last kept row must be the quote it should be
+            line = tail[tail.rfind(b"\n", 0, cut) + 1:cut].strip().rstrip(b",")
+            try:
+                if json.loads(line)['id'] != quotes._ids[keep - 1]:
+                    return False
+            except (ValueError, KeyError, TypeError):
+                return False
+            cut = pos + cut - (tail[cut - 1:cut] == b",")
+            f.seek(0)
+            with open(tmp_path, 'wb', buffering=1 << 20) as out:
+                while cut:
+                    chunk = f.read(min(cut, 1 << 20))
+                    if not chunk:
+                        return False
+                    out.write(chunk)
+                    cut -= len(chunk)
+                for row in _json_rows(quotes[i] for i in range(keep, len(quotes))):
+                    out.write((",\n\t" + row).encode('utf-8'))
+                out.write(b"\n\n]}")
+        os.replace(tmp_path, file_path)
+        return True
+    except OSError as e:
+        print(f"Error updating '{file_path}': {e}")
+        return False
+
+@stats.timed("jsonl_encode")
+def encode_quotes_to_jsonl(file_path: str, quotes: 'Iterable[_quote] | None' = None) -> None:
+    """Write quotes as JSON Lines: one JSON object per line, no enclosing list"""
+    quote_list = quotes if quotes is not None else get_quote_list()
+    tmp_path = file_path + ".tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            for row in _json_rows(quote_list):
+                f.write(row)
+                f.write("\n")
+        os.replace(tmp_path, file_path)
+    except Exception as e:
+        print(f"Error writing quotes: {e}")
+
+def iter_quotes_from_jsonl(file_path: str) -> Iterator[_quote]:
+    """Read a JSON Lines file written by encode_quotes_to_jsonl, one quote at a time"""
+    from_dict = _quote.from_dict
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield from_dict(json.loads(line))
+
+
+def _fingerprint(path: str, previous: dict | None = None) -> dict:
+    """Return mtime/size/sha256 for a file.
+
+    If `previous` has the same mtime and size, its hash is reused instead of
+    reading the file again.
+    """
+    st = os.stat(path)
+    fp = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size}
+    if previous and previous.get('mtime_ns') == fp['mtime_ns'] and previous.get('size') == fp['size']:
+        fp['sha256'] = previous.get('sha256')
+        return fp
+    import hashlib
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    fp['sha256'] = h.hexdigest()
+    return fp
+
+def _read_cache_meta(cache_path: str) -> dict:
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _write_cache_meta(cache_path: str, meta: dict) -> None:
+    tmp_path = cache_path + ".tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Error writing cache metadata '{cache_path}': {e}")
+
+def _fresh_fingerprint(path: str, recorded: dict | None) -> dict | None:
+    """Fingerprint `path` if its content still matches `recorded`, else None"""
+    if not recorded:
+        return None
+    try:
+        fp = _fingerprint(path, recorded)
+    except OSError:
+        return None
+    return fp if fp['sha256'] == recorded.get('sha256') else None
+
+def _open_cached(meta: dict, json_path: str, snapshot_path: str) -> 'tuple[QuoteStore | MappedQuoteStore | None, dict]':
+    """Open the snapshot (or quotes.json) recorded in `meta` if it is unchanged.
+
+    Returns the quotes, or None, and the current fingerprints of whichever
+    cached files are still valid.
+    """
+    fresh = {}
+    for key, path in (('json', json_path), ('snapshot', snapshot_path)):
+        fp = _fresh_fingerprint(path, meta.get(key))
+        if fp is not None:
+            fresh[key] = fp
+    if 'snapshot' in fresh:
+        try:
+            return MappedQuoteStore(snapshot_path), fresh
+        except (OSError, ValueError) as e:
+            print(f"Error opening snapshot '{snapshot_path}': {e}")
+            del fresh['snapshot']
+    if 'json' in fresh:
+        quotes = QuoteStore(load_quotes_from_json(json_path))
+        if quotes:
+            return quotes, fresh
+    return None, fresh
+
+def _iter_raw_blocks(f, offset: int, chunk_size: int = 1 << 16) -> Iterator[tuple[int, bytes, bool]]:
+    """Yield (byte offset, block, is_last) from a binary file starting at `offset`.
+
+    Splits exactly like _iter_blocks does on the decoded text, so that offsets
+    can be saved and parsing resumed later. Files with CRLF line endings
+    cannot be split this way and raise ValueError.
+    """
+    f.seek(offset)
+    buf = b""
+    pos = offset
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        if b"\r" in chunk:
+            raise ValueError("CRLF line endings, incremental extraction not possible")
+        buf += chunk
+        parts = buf.split(b"\n\n")
+        buf = parts.pop()
+        for part in parts:
+            yield pos, part, False
+            pos += len(part) + 2
+    yield pos, buf, True
+
+def _resume_point(f, sections: list[dict]) -> tuple[list[dict], dict]:
+    """Find where parsing has to restart.
+
+    Returns the leading sections whose bytes are unchanged and the checkpoint
+    of the first section that changed (or of the end of the parsed content).
+    """
+    import hashlib
+    kept: list[dict] = []
+    for sec in sections:
+        if 'sha256' not in sec:
+            return kept, sec
+        f.seek(sec['offset'])
+        data = f.read(sec['length'])
+        if len(data) != sec['length'] or hashlib.sha256(data).hexdigest() != sec['sha256']:
+            return kept, {k: v for k, v in sec.items() if k not in ('length', 'sha256')}
+        kept.append(sec)
+    return [], {'offset': 0, 'year': 2022, 'month': None, 'day': None, 'count': 0}
+
+def _unchanged_count(old: list[dict] | None, new: list[dict] | None) -> int:
+    """How many leading quotes two parses share, from their section checkpoints.
+
+    Sections match while their offset, length and sha256 agree; the quotes
+    before the first one that differs (or before the end marker) are the
+    same in both.
+    """
+    if not old or not new:
+        return 0
+    for a, b in zip(old, new):
+        if 'sha256' not in a or 'sha256' not in b or \
+                (a['offset'], a['length'], a['sha256']) != (b['offset'], b['length'], b['sha256']):
+            return min(a['count'], b['count'])
+    return min(old[-1]['count'], new[-1]['count'])
+
+@stats.timed("extract_incremental")
+def extract_incremental(filename: str = _source_file,
+                        quotes: 'QuoteStore | MappedQuoteStore | None' = None,
+                        sections: list[dict] | None = None,
+                        section_size: int = 1 << 16,
+                        origin: str = _origin) -> tuple[QuoteStore, list[dict]]:
+    """Re-extract only what changed since `quotes` were parsed from `filename`.
+
+    `sections` are the checkpoints returned by the previous call: each one
+    records a byte offset, the parser's year/month/day at that offset, the
+    number of quotes before it and the sha256 of the section's bytes. The
+    last one marks where the previous parse stopped. Parsing restarts at the
+    first section whose bytes differ, or at that end marker when the file was
+    only appended to, so a pure append costs time proportional to the new
+    text. With no sections (or no quotes) the whole file is parsed.
+
+    New quotes get their stable_id() and are attributed to `origin`.
+    Returns the updated quotes and the new checkpoints.
+    """
+    import hashlib
+    with open(filename, 'rb') as f:
+        if quotes is None or not sections:
+            kept, resume = _resume_point(f, [])
+        else:
+            kept, resume = _resume_point(f, sections)
+            if resume['count'] > len(quotes):
+                kept, resume = _resume_point(f, [])
+        count = resume['count']
+        if isinstance(quotes, QuoteStore):
+            store = quotes
+        elif isinstance(quotes, MappedQuoteStore):
+            store = QuoteStore.from_snapshot(quotes)
+        else:
+            store = QuoteStore()
+            for i in range(count):
+                q = quotes[i]  # type: ignore[index]
+                store.add(q.content, q.date, q.origin, q.id)
+        store.truncate(count)
+
+        parser = _Parser(resume['year'], resume['month'], resume['day'])
+        current = dict(resume)
+        h = hashlib.sha256()
+        for offset, raw, last in _iter_raw_blocks(f, resume['offset']):
+            if offset > current['offset'] and (last or offset - current['offset'] >= section_size):
+                current['length'] = offset - current['offset']
+                current['sha256'] = h.hexdigest()
+                kept.append(current)
+                current = {'offset': offset, 'year': parser.year, 'month': parser.month,
+                           'day': parser.day, 'count': len(store)}
+                h = hashlib.sha256()
+            if not last:
+                h.update(raw)
+                h.update(b"\n\n")
+            q = raw.decode('utf-8')
+            date = parser.feed(q)
+            if date is not None:
+                store.add(q, date, origin)
+        kept.append(current)
+    return store, kept
+
+@stats.timed("load_corpus")
+def load_corpus(source: str = _source_file, json_path: str = _json_file,
+                cache_path: str = _cache_file, force: bool = False,
+                snapshot_path: str = _snapshot_file,
+                origin: str = _origin) -> 'QuoteStore | MappedQuoteStore':
+    """Load the quotes, re-parsing the text file only when it has changed.
+
+    The cache metadata file records the mtime, size and sha256 of the source
+    text, quotes.json and the binary snapshot as of the last extraction, the
+    section checkpoints used by extract_incremental and the number of
+    quotes. When the source still matches, the snapshot is memory-mapped (or,
+    failing that, quotes.json is loaded). If only an mtime moved (e.g. after
+    a fresh checkout), the hash decides. Otherwise only the changed or appended part
+    of the text is re-parsed. The unchanged rows of quotes.json are copied
+    rather than re-encoded, and both it and the snapshot are written to new
+    files that replace the old ones, so stores that still have the old
+    snapshot mapped keep working. Quotes parsed from the text are attributed
+    to `origin`.
+    """
+    meta = _read_cache_meta(cache_path)
+    if meta.get('format') != CACHE_FORMAT:
+        meta = {}
+    try:
+        src_fp = _fingerprint(source, meta.get('source'))
+    except OSError:
+        # No text file to compare against, use whatever JSON there is
+        return QuoteStore(load_quotes_from_json(json_path))
+
+    cached = None
+    fresh: dict = {}
+    if not force:
+        cached, fresh = _open_cached(meta, json_path, snapshot_path)
+        if cached is not None and meta.get('source', {}).get('sha256') == src_fp['sha256']:
+            fresh = {'format': CACHE_FORMAT, 'source': src_fp, **fresh}
+            if 'sections' in meta:
+                fresh['sections'] = meta['sections']
+            fresh['count'] = len(cached)
+            if fresh != meta:
+                _write_cache_meta(cache_path, fresh)
+            return cached
+
+    new_meta: dict = {'format': CACHE_FORMAT, 'source': src_fp}
+    try:
+        quotes, new_meta['sections'] = extract_incremental(source, cached, meta.get('sections') if cached is not None else None,
+                                                           origin=origin)
+    except ValueError:
+        quotes = QuoteStore()
+        for q in iter_extract(source):
+            quotes.add(q.content, q.date, origin)
+        new_meta.pop('sections', None)
+    # Quotes before the first changed section are already in the cached files
+    keep = min(_unchanged_count(meta.get('sections'), new_meta.get('sections')), len(cached)) if cached is not None else 0
+    count = len(cached) if cached is not None else 0
+    if isinstance(cached, MappedQuoteStore):
+        cached.close()
+    if not (keep and 'json' in fresh and _append_json(json_path, quotes, keep, count)):
+        encode_quotes_to_json(json_path, quotes)
+    try:
+        write_snapshot(snapshot_path, quotes)
+        new_meta['snapshot'] = _fingerprint(snapshot_path)
+    except OSError as e:
+        print(f"Error writing snapshot '{snapshot_path}': {e}")
+    try:
+        new_meta['json'] = _fingerprint(json_path)
+    except OSError:
+        pass
+    new_meta['count'] = len(quotes)
+    _write_cache_meta(cache_path, new_meta)
+    return quotes
+
+_quote_list: 'QuoteStore | MappedQuoteStore | None' = None
+# Bumped every time _quote_list is (re)loaded, so caches built from it know when to refresh
+generation = 0
+
+def get_quote_list() -> 'QuoteStore | MappedQuoteStore':
+    """Return the module's quote list, loading it on first use."""
+    global _quote_list, generation
+    if _quote_list is None:
+        _quote_list = load_corpus()
+        generation += 1
+    return _quote_list
+
+def reload_quote_list() -> 'QuoteStore | MappedQuoteStore':
+    """Load the quotes again (if the text changed) and make them the module's quote list.
+
+    The old store is left untouched for anyone still holding it.
+    """
+    global _quote_list, generation
+    _quote_list = load_corpus()
+    generation += 1
+    return _quote_list
+
+def __getattr__(name: str):
+    # `quote_list` is loaded lazily so that importing this module stays cheap
+    if name == "quote_list":
+        return get_quote_list()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+__all__ = [
+    "extract", "iter_extract", "extract_incremental", "extract_parallel", "load_quotes_from_json", "encode_quotes_to_json",
+    "encode_quotes_to_jsonl", "iter_quotes_from_jsonl",
+    "QuoteStore", "MappedQuoteStore", "write_snapshot", "pack_date", "unpack_date",
+    "stable_id", "manifest", "diff_manifest",
+    "load_corpus", "get_quote_list", "reload_quote_list", "quote_list", "test",
+]
+
+if __name__ == "__main__":
+    _quote_list = load_corpus(force=True)
+    print(f"{len(_quote_list)} quotes extracted to {_json_file}")
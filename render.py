@@ -0,0 +1,138 @@
+"""Precomputed text renderings of quotes.
+
+Formats:
+- "plain": str(quote), e.g. `"Siiiix" -- Jordi A. Navarrette, 2024`
+- "notification": plain text cut to 200 characters for desktop toasts
+- "apa": APA 7 reference entry for the quote
+- "mla": MLA 9 works-cited entry for the quote
+
+render() memoizes on the quote's fields, so a quote whose content, date or
+origin changes is simply rendered again. RenderCache keeps whole columns of
+rendered text for a quote store and is what render_all() serves from.
+"""
+from functools import lru_cache
+
+import quote
+from quote import _numbers_to_months, _quote
+
+FORMATS = ("plain", "notification", "apa", "mla")
+NOTIFICATION_LENGTH = 200
+_repo_url = "https://github.com/Eddy12597/JordiQuotes"
+_full_months = ("January", "February", "March", "April", "May", "June", "July",
+                "August", "September", "October", "November", "December")
+
+
+def _author(origin: str, style: str) -> str:
+    """'Jordi A. Navarrette' -> 'Navarrette, J. A.' (APA) or 'Navarrette, Jordi A.' (MLA)"""
+    parts = origin.split()
+    if len(parts) < 2:
+        return origin
+    if style == "apa":
+        initials = " ".join(p[0] + "." for p in parts[:-1])
+        return f"{parts[-1]}, {initials}"
+    return f"{parts[-1]}, {' '.join(parts[:-1])}"
+
+
+def _apa_date(date: tuple) -> str:
+    year, month, day = date
+    if not year:
+        return "n.d."
+    if month is None:
+        return str(year)
+    if day is None:
+        return f"{year}, {_full_months[month - 1]}"
+    return f"{year}, {_full_months[month - 1]} {day}"
+
+
+def _mla_date(date: tuple) -> str:
+    year, month, day = date
+    if not year:
+        return "n.d."
+    if month is None:
+        return str(year)
+    # MLA abbreviates months longer than four letters
+    name = _full_months[month - 1]
+    name = name if len(name) <= 4 else _numbers_to_months[month] + "."
+    return f"{name} {year}" if day is None else f"{day} {name} {year}"
+
+
+@lru_cache(maxsize=65536)
+def _render(fmt: str, content: str, date: tuple, origin: str) -> str:
+    if fmt == "plain":
+        return str(_quote._make(content, date, origin, -1))
+    if fmt == "notification":
+        message = _render("plain", content, date, origin)
+        if len(message) > NOTIFICATION_LENGTH:
+            message = message[:NOTIFICATION_LENGTH - 3] + "..."
+        return message
+    if fmt == "apa":
+        return (f"{_author(origin, 'apa')} ({_apa_date(date)}). {content}. "
+                f"In Zhang et al., JordiQuotes. {_repo_url}")
+    if fmt == "mla":
+        author = _author(origin, 'mla').rstrip(".")
+        return (f"{author}. {content}. {_mla_date(date)}. "
+                f"JordiQuotes, Zhang et al., {_repo_url.removeprefix('https://')}.")
+    raise ValueError(f"Unknown format '{fmt}'. Choose from: {', '.join(FORMATS)}")
+
+
+def render(q: _quote, fmt: str = "plain") -> str:
+    """Text for one quote in the given format"""
+    return _render(fmt, q.content, q.date, q.origin)
+
+
+class RenderCache:
+    """Rendered text for every quote in a store, one list per format.
+
+    A column is built the first time a format is asked for. Columns are
+    dropped when the store's existing entries change (its `version` moves)
+    and extended when quotes are appended.
+    """
+
+    def __init__(self, quotes):
+        self.quotes = quotes
+        self._columns: dict[str, list[str]] = {}
+        self._version = getattr(quotes, "version", 0)
+
+    def invalidate(self) -> None:
+        self._columns.clear()
+
+    def _column(self, fmt: str) -> list[str]:
+        version = getattr(self.quotes, "version", 0)
+        if version != self._version:
+            self._columns.clear()
+            self._version = version
+        column = self._columns.get(fmt)
+        if column is None:
+            if fmt not in FORMATS:
+                raise ValueError(f"Unknown format '{fmt}'. Choose from: {', '.join(FORMATS)}")
+            column = self._columns[fmt] = []
+        n = len(self.quotes)
+        if len(column) < n:
+            column.extend(render(q, fmt) for q in self.quotes[len(column):n])
+        elif len(column) > n:
+            del column[n:]
+        return column
+
+    def get(self, index: int, fmt: str = "plain") -> str:
+        return self._column(fmt)[index]
+
+    def render_all(self, fmt: str = "plain") -> list[str]:
+        return self._column(fmt)
+
+
+_cache: RenderCache | None = None
+
+
+def render_all(fmt: str = "plain", quotes=None) -> list[str]:
+    """Every quote rendered in `fmt`, in store order.
+
+    Without `quotes`, serves from a cache over quote_list, so repeated calls
+    cost nothing after the first.
+    """
+    global _cache
+    if quotes is not None:
+        return [render(q, fmt) for q in quotes]
+    ql = quote.get_quote_list()
+    if _cache is None or _cache.quotes is not ql:
+        _cache = RenderCache(ql)
+    return _cache.render_all(fmt)
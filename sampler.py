@@ -0,0 +1,160 @@
+"""Filtered and weighted random sampling over the quote corpus.
+
+Facets (year, speaker) are precomputed as arrays of store positions, so a
+filtered draw is one index into an array instead of a scan. Weighted draws use
+Vose alias tables: O(n) to build once per pool, O(1) per draw. Recently shown
+quotes are kept in a sliding window and rejected on draw.
+
+Speaker facet:
+- "student" for quotes with a line starting with "S: "
+- "teacher" for everything else
+"""
+from array import array
+from collections import deque
+import random
+
+from quote import pack_date
+
+SPEAKERS = ("student", "teacher")
+
+
+class AliasTable:
+    """Vose's alias method over a list of non-negative weights"""
+    __slots__ = ("_prob", "_alias")
+
+    def __init__(self, weights: list[float]):
+        n = len(weights)
+        total = sum(weights)
+        if n == 0 or total <= 0:
+            raise ValueError("alias table needs a positive total weight")
+        scaled = [w * n / total for w in weights]
+        prob = array('d', bytes(8 * n))
+        alias = array('I', bytes(4 * n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Whatever is left is 1 up to rounding
+        for i in large + small:
+            prob[i] = 1.0
+        self._prob = prob
+        self._alias = alias
+
+    def __len__(self) -> int:
+        return len(self._prob)
+
+    def sample(self, rng: random.Random) -> int:
+        i = int(rng.random() * len(self._prob))
+        return i if rng.random() < self._prob[i] else self._alias[i]
+
+
+def _day_number(key: int) -> int:
+    """Rough day count for a packed date; missing parts count as the first"""
+    if key < 0:
+        return 0
+    year, rest = divmod(key, 10000)
+    month, day = divmod(rest, 100)
+    return year * 372 + max(month - 1, 0) * 31 + max(day - 1, 0)
+
+
+class Sampler:
+    def __init__(self, quotes, window: int = 0, half_life: float = 365.0,
+                 rng: random.Random | None = None):
+        self.quotes = quotes
+        self.half_life = half_life
+        self.rng = rng if rng is not None else random.Random()
+        self._recent: deque[int] = deque(maxlen=window) if window > 0 else deque(maxlen=0)
+        self._recent_set: set[int] = set()
+        self._pools: dict[tuple, array] = {}
+        self._tables: dict[tuple, AliasTable] = {}
+
+        n = len(quotes)
+        date_key = getattr(quotes, "date_key", None)
+        content = getattr(quotes, "content", None)
+        keys = [date_key(i) if date_key is not None else pack_date(quotes[i].date) for i in range(n)]
+        years: dict[int, list[int]] = {}
+        speakers: dict[str, list[int]] = {s: [] for s in SPEAKERS}
+        for i, key in enumerate(keys):
+            if key >= 0:
+                years.setdefault(key // 10000, []).append(i)
+            text = content(i) if content is not None else quotes[i].content
+            student = text.startswith("S: ") or "\nS: " in text
+            speakers["student" if student else "teacher"].append(i)
+        self._years = {y: array('I', ix) for y, ix in years.items()}
+        self._speakers = {s: array('I', ix) for s, ix in speakers.items()}
+        newest = max(map(_day_number, keys), default=0)
+        self._ages = array('i', (newest - _day_number(k) for k in keys))
+
+    def years(self) -> list[int]:
+        return sorted(self._years)
+
+    def pool(self, year: int | None = None, speaker: str | None = None) -> array:
+        """Store positions matching the filters, cached per combination"""
+        key = (year, speaker)
+        pool = self._pools.get(key)
+        if pool is None:
+            if speaker is not None and speaker not in SPEAKERS:
+                raise ValueError(f"unknown speaker {speaker!r}, expected one of {SPEAKERS}")
+            if year is None and speaker is None:
+                pool = array('I', range(len(self.quotes)))
+            elif speaker is None:
+                pool = self._years.get(year, array('I'))
+            elif year is None:
+                pool = self._speakers[speaker]
+            else:
+                wanted = set(self._speakers[speaker])
+                pool = array('I', (i for i in self._years.get(year, ()) if i in wanted))
+            self._pools[key] = pool
+        return pool
+
+    def _table(self, key: tuple, pool: array) -> AliasTable:
+        table = self._tables.get(key)
+        if table is None:
+            ages = self._ages
+            decay = 0.5 ** (1.0 / self.half_life)
+            table = self._tables[key] = AliasTable([decay ** ages[i] for i in pool])
+        return table
+
+    def sample(self, year: int | None = None, speaker: str | None = None,
+               weighted: bool = False, exclude_recent: bool = True) -> int:
+        """Store position of a random quote; raises LookupError if none match
+
+        weighted: favour newer quotes; a quote half_life days older is half
+        as likely to come up.
+        """
+        key = (year, speaker)
+        pool = self.pool(year, speaker)
+        if not pool:
+            raise LookupError(f"no quotes match year={year!r} speaker={speaker!r}")
+        table = self._table(key, pool) if weighted else None
+        recent = self._recent_set if exclude_recent else ()
+        rng = self.rng
+        for _ in range(32):
+            j = table.sample(rng) if table is not None else int(rng.random() * len(pool))
+            i = pool[j]
+            if i not in recent:
+                break
+        else:
+            # The window covers most of this pool; pick from what is left
+            rest = [j for j, i in enumerate(pool) if i not in recent] or range(len(pool))
+            j = rng.choice(rest)
+            i = pool[j]
+        self.mark_shown(i)
+        return i
+
+    def mark_shown(self, i: int) -> None:
+        recent = self._recent
+        if recent.maxlen == 0:
+            return
+        if len(recent) == recent.maxlen:
+            old = recent[0]
+            recent.append(i)
+            if old not in recent:
+                self._recent_set.discard(old)
+        else:
+            recent.append(i)
+        self._recent_set.add(i)
@@ -0,0 +1,205 @@
+"""Heap-based scheduler for daily quote notifications.
+
+Jobs live in a heap ordered by their next due time, and the run loop sleeps
+on a condition variable exactly until the earliest one is due. Adding or
+cancelling a job, or stop(), wakes it early. There is no polling, so
+thousands of jobs (one per subscriber, each in its own time zone) cost
+nothing between fires.
+
+If the process was suspended (a laptop asleep), the loop wakes late and
+finds jobs overdue. Each overdue job fires once, and `missed` counts the
+occurrences it skipped, rather than replaying every missed day.
+Condition waits run on the monotonic clock, which may not count time spent
+suspended, so a wait can overshoot by the length of the suspend. `max_sleep`
+(off by default) splits long waits into chunks to bound that; a wait after
+which the wall clock moved well past the monotonic one is counted in
+`resumes`.
+"""
+from datetime import datetime, timedelta
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable
+
+
+# Wall-clock time beyond the monotonic time of a wait that counts as a resume
+RESUME_JUMP = 5.0
+
+
+class RealClock:
+    def now(self) -> float:
+        return time.time()
+
+    def wait(self, cond: threading.Condition, timeout: float | None) -> float:
+        """Wait, and return how far the wall clock moved beyond the monotonic clock"""
+        wall, mono = time.time(), time.monotonic()
+        cond.wait(timeout)
+        return (time.time() - wall) - (time.monotonic() - mono)
+
+
+class VirtualClock:
+    """Clock for simulations: waiting jumps straight to the timeout"""
+
+    def __init__(self, start: float = 0.0):
+        self.t = start
+
+    def now(self) -> float:
+        return self.t
+
+    def wait(self, cond: threading.Condition, timeout: float | None) -> float:
+        if timeout is None:
+            raise RuntimeError("VirtualClock cannot wait without a timeout")
+        self.t += max(timeout, 0.0)
+        return 0.0
+
+
+class DailyJob:
+    """A callback fired every day at HH:MM in a time zone (local time if None)"""
+
+    def __init__(self, at: str, callback: Callable[[], object], tz: str | None = None):
+        hour, minute = at.split(":")
+        self.hour = int(hour)
+        self.minute = int(minute)
+        self.callback = callback
+        if tz is not None:
+            from zoneinfo import ZoneInfo
+            self.tz = ZoneInfo(tz)
+        else:
+            self.tz = None
+        self.cancelled = False
+        self.fired = 0
+        self.missed = 0
+        self.due = 0.0
+
+    def next_after(self, ts: float) -> float:
+        """Timestamp of the first occurrence strictly after `ts`"""
+        dt = datetime.fromtimestamp(ts, self.tz)
+        candidate = dt.replace(hour=self.hour, minute=self.minute, second=0, microsecond=0)
+        while candidate.timestamp() <= ts:
+            dt += timedelta(days=1)
+            candidate = dt.replace(hour=self.hour, minute=self.minute, second=0, microsecond=0)
+        return candidate.timestamp()
+
+
+def _occurrences_between(job: DailyJob, start: float, end: float) -> int:
+    """Number of occurrences of `job` in (start, end]"""
+    n = 0
+    t = job.next_after(start)
+    while t <= end:
+        n += 1
+        t = job.next_after(t)
+    return n
+
+
+class Scheduler:
+    def __init__(self, clock=None, max_sleep: float | None = None):
+        self.clock = clock or RealClock()
+        self.max_sleep = max_sleep
+        self.wakeups = 0
+        self.resumes = 0
+        self._heap: list[tuple[float, int, DailyJob]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._running = False
+
+    def __len__(self) -> int:
+        return sum(1 for _, _, job in self._heap if not job.cancelled)
+
+    def every_day_at(self, at: str, callback: Callable[[], object], tz: str | None = None) -> DailyJob:
+        job = DailyJob(at, callback, tz)
+        with self._cond:
+            job.due = job.next_after(self.clock.now())
+            heapq.heappush(self._heap, (job.due, next(self._seq), job))
+            self._cond.notify()
+        return job
+
+    def cancel(self, job: DailyJob) -> None:
+        with self._cond:
+            job.cancelled = True
+            self._cond.notify()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+
+    def run(self, until: float | None = None) -> None:
+        """Fire jobs as they come due until stop() (or the clock reaches `until`)"""
+        with self._cond:
+            self._running = True
+            while self._running:
+                heap = self._heap
+                while heap and heap[0][2].cancelled:
+                    heapq.heappop(heap)
+                now = self.clock.now()
+                if heap and heap[0][0] <= now:
+                    due, _, job = heapq.heappop(heap)
+                    next_due = job.next_after(now)
+                    # Occurrences between the one being fired and now were slept through
+                    job.missed += _occurrences_between(job, due, now)
+                    job.due = next_due
+                    heapq.heappush(heap, (next_due, next(self._seq), job))
+                    self._cond.release()
+                    try:
+                        job.fired += 1
+                        job.callback()
+                    except Exception as e:
+                        print(f"Scheduled job failed: {e}")
+                    finally:
+                        self._cond.acquire()
+                    continue
+                if until is not None and (not heap or heap[0][0] > until):
+                    if isinstance(self.clock, VirtualClock):
+                        self.clock.t = max(self.clock.t, until)
+                    break
+                timeout = heap[0][0] - now if heap else None
+                if self.max_sleep is not None:
+                    timeout = self.max_sleep if timeout is None else min(timeout, self.max_sleep)
+                if until is not None:
+                    timeout = until - now if timeout is None else min(timeout, until - now)
+                self.wakeups += 1
+                if (self.clock.wait(self._cond, timeout) or 0.0) > RESUME_JUMP:
+                    # Suspended (or the clock was set forward): due times are rechecked right away
+                    self.resumes += 1
+            self._running = False
+
+
+def test():
+    """Simulate a year of fires for many subscribers on a virtual clock"""
+    start = datetime(2025, 1, 1, 0, 0).timestamp()
+    end = datetime(2026, 1, 1, 0, 0).timestamp()
+    clock = VirtualClock(start)
+    sched = Scheduler(clock)
+    zones = [None, "UTC", "Europe/Madrid", "America/New_York", "Asia/Shanghai", "Australia/Sydney"]
+    jobs = []
+    for i in range(1000):
+        job = sched.every_day_at(f"{i % 24:02d}:{(i * 7) % 60:02d}", lambda: None, zones[i % len(zones)])
+        jobs.append(job)
+    cancelled = jobs[::10]
+    sched.run(until=start + 100 * 86400)
+    for job in cancelled:
+        sched.cancel(job)
+    sched.run(until=end)
+    for job in jobs:
+        expected = _occurrences_between(job, start, end) if job not in cancelled else \
+            _occurrences_between(job, start, start + 100 * 86400)
+        assert job.fired == expected, (job.hour, job.minute, job.tz, job.fired, expected)
+    total = sum(job.fired for job in jobs)
+    # One wakeup per distinct due time, nothing in between
+    assert sched.wakeups <= total, (sched.wakeups, total)
+    print(f"{len(jobs)} jobs, {total} fires over a year, {sched.wakeups} wakeups")
+
+    # A week asleep: the job fires once on resume and records the skipped days
+    clock = VirtualClock(start)
+    sched = Scheduler(clock)
+    job = sched.every_day_at("09:00", lambda: None)
+    sched.run(until=start + 86400)
+    clock.t += 7 * 86400
+    sched.run(until=clock.t)
+    assert job.fired == 2 and job.missed == 6, (job.fired, job.missed)
+    print(f"after a week asleep: fired {job.fired}, missed {job.missed}")
+
+
+if __name__ == "__main__":
+    test()
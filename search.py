@@ -0,0 +1,331 @@
+"""Full-text search over quote content.
+
+The index maps each token to a postings list (document numbers and term
+frequencies) and ranks matches with BM25. Queries are whitespace-separated
+terms, "double-quoted phrases" and prefix terms ending in `*`:
+
+>>> from search import search
+>>> for q in search("radians", limit=3):
+...     print(q)
+"""
+from array import array
+import heapq
+import math
+import os
+import pickle
+import re
+import sys
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Iterable, Sequence
+
+import quote
+from quote import _quote
+
+_index_file = os.path.join(quote._here, "quotes.index")
+INDEX_VERSION = 1
+
+_token_re = re.compile(r"\w+")
+_query_re = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased word tokens of `text`"""
+    return _token_re.findall(text.lower())
+
+
+def _idf(n: int, df: int) -> float:
+    return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+
+class CollectionStats:
+    """BM25 collection statistics over several indexes searched as one.
+
+    Each index alone has its own document count, term frequencies and
+    average length, so its scores do not compare with another index's.
+    """
+
+    def __init__(self, indexes: Iterable['SearchIndex']):
+        self.indexes = list(indexes)
+        self.n = sum(len(index) for index in self.indexes)
+        self.avgdl = (sum(index._total_length for index in self.indexes) / self.n if self.n else 0) or 1.0
+        self._df: dict[str, int] = {}
+
+    def df(self, term: str) -> int:
+        """Number of documents containing `term` across the indexes"""
+        df = self._df.get(term)
+        if df is None:
+            df = self._df[term] = sum(len(entry[0]) for index in self.indexes
+                                      if (entry := index.postings.get(term)) is not None)
+        return df
+
+
+class SearchIndex:
+    """Inverted index with BM25 ranking, phrase and prefix queries.
+
+    Documents are numbered in the order they are added, which matches their
+    position in the quote store the index was built from.
+    """
+
+    k1 = 1.2
+    b = 0.75
+    cache_size = 1024
+
+    def __init__(self):
+        self.postings: dict[str, tuple[array, array]] = {}
+        self.doc_lengths = array('I')
+        self._total_length = 0
+        self._sorted_terms: list[str] | None = None
+        self._results: OrderedDict[tuple[str, int], list[tuple[float, int]]] = OrderedDict()
+        self.source_sha256: str | None = None
+        # Section checkpoints of the source the index was built from (see quote.extract_incremental)
+        self.sections: list[dict] | None = None
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def add(self, text: str) -> int:
+        """Index one document and return its number"""
+        doc = len(self.doc_lengths)
+        tokens = tokenize(text)
+        counts: dict[str, int] = {}
+        for t in tokens:
+            counts[t] = counts.get(t, 0) + 1
+        for t, tf in counts.items():
+            entry = self.postings.get(t)
+            if entry is None:
+                # Interned, so corpora indexed in one process share their term strings
+                entry = self.postings[sys.intern(t)] = (array('I'), array('H'))
+                self._sorted_terms = None
+            entry[0].append(doc)
+            entry[1].append(min(tf, 0xFFFF))
+        self.doc_lengths.append(len(tokens))
+        self._total_length += len(tokens)
+        self._results.clear()
+        return doc
+
+    def truncate(self, n: int) -> None:
+        """Drop every document from number `n` on"""
+        if n >= len(self.doc_lengths):
+            return
+        for t in list(self.postings):
+            docs, tfs = self.postings[t]
+            k = bisect_left(docs, n)
+            if k == 0:
+                del self.postings[t]
+                self._sorted_terms = None
+            elif k < len(docs):
+                del docs[k:]
+                del tfs[k:]
+        del self.doc_lengths[n:]
+        self._total_length = sum(self.doc_lengths)
+        self._results.clear()
+
+    def extend(self, quotes: Iterable[_quote]) -> None:
+        for q in quotes:
+            self.add(q.content)
+
+    def expand_prefix(self, prefix: str, limit: int = 64) -> list[str]:
+        """Indexed terms starting with `prefix`, at most `limit` of them"""
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self.postings)
+        terms = self._sorted_terms
+        out = []
+        i = bisect_left(terms, prefix)
+        while i < len(terms) and terms[i].startswith(prefix) and len(out) < limit:
+            out.append(terms[i])
+            i += 1
+        return out
+
+    def _accumulate(self, term: str, scores: dict[int, float], allowed: set[int] | None = None,
+                    collection: 'CollectionStats | None' = None) -> None:
+        entry = self.postings.get(term)
+        if entry is None:
+            return
+        docs, tfs = entry
+        if collection is None:
+            idf = _idf(len(self.doc_lengths), len(docs))
+            avgdl = self._total_length / len(self.doc_lengths) or 1.0
+        else:
+            idf = _idf(collection.n, collection.df(term))
+            avgdl = collection.avgdl
+        k1, b = self.k1, self.b
+        lengths = self.doc_lengths
+        for d, tf in zip(docs, tfs):
+            if allowed is not None and d not in allowed:
+                continue
+            scores[d] = scores.get(d, 0.0) + idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * lengths[d] / avgdl))
+
+    def _docs_with_all(self, terms: list[str]) -> set[int]:
+        entries = [self.postings.get(t) for t in terms]
+        if not entries or any(e is None for e in entries):
+            return set()
+        entries.sort(key=lambda e: len(e[0]))
+        docs = set(entries[0][0])
+        for e in entries[1:]:
+            docs.intersection_update(e[0])
+            if not docs:
+                break
+        return docs
+
+    def search(self, query: str, limit: int = 10, contents: Sequence[str] | None = None,
+               collection: 'CollectionStats | None' = None) -> list[tuple[float, int]]:
+        """Rank documents for `query` and return up to `limit` (score, doc) pairs.
+
+        Phrase matches are checked against the original text, so `contents`
+        (anything indexable by document number giving its text) is required
+        for queries containing "quoted phrases". Results are cached per
+        (query, limit) until the next document is added, since terms that
+        occur in a large share of the corpus are costly to score.
+
+        With `collection`, documents are scored with its document count,
+        frequencies and average length instead of this index's own, so the
+        scores compare with those of the other indexes it covers. Those
+        results are not cached.
+        """
+        if collection is not None:
+            return self._search(query, limit, contents, collection)
+        key = (query, limit)
+        cached = self._results.get(key)
+        if cached is not None:
+            self._results.move_to_end(key)
+            return cached
+        hits = self._search(query, limit, contents)
+        self._results[key] = hits
+        if len(self._results) > self.cache_size:
+            self._results.popitem(last=False)
+        return hits
+
+    def _search(self, query: str, limit: int, contents: Sequence[str] | None,
+                collection: 'CollectionStats | None' = None) -> list[tuple[float, int]]:
+        terms: list[str] = []
+        phrases: list[list[str]] = []
+        for phrase, word in _query_re.findall(query):
+            if phrase:
+                tokens = tokenize(phrase)
+                if tokens:
+                    phrases.append(tokens)
+                    terms.extend(tokens)
+            elif word.endswith("*") and len(word) > 1:
+                prefix = tokenize(word[:-1])
+                if prefix:
+                    terms.extend(prefix[:-1])
+                    terms.extend(self.expand_prefix(prefix[-1]))
+            else:
+                terms.extend(tokenize(word))
+
+        allowed = None
+        if phrases:
+            if contents is None:
+                raise ValueError("phrase queries need the document contents")
+            allowed = self._docs_with_all([t for p in phrases for t in p])
+            allowed = {d for d in allowed if all(_has_phrase(tokenize(contents[d]), p) for p in phrases)}
+            if not allowed:
+                return []
+
+        scores: dict[int, float] = {}
+        for t in dict.fromkeys(terms):
+            self._accumulate(t, scores, allowed, collection)
+        return heapq.nlargest(limit, ((s, d) for d, s in scores.items()))
+
+    def save(self, file_path: str = _index_file) -> None:
+        tmp_path = file_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({
+                'version': INDEX_VERSION,
+                'source_sha256': self.source_sha256,
+                'sections': self.sections,
+                'postings': self.postings,
+                'doc_lengths': self.doc_lengths,
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, file_path)
+
+    @classmethod
+    def load(cls, file_path: str = _index_file) -> 'SearchIndex':
+        with open(file_path, 'rb') as f:
+            data = pickle.load(f)
+        if data.get('version') != INDEX_VERSION:
+            raise ValueError(f"'{file_path}' is not a version {INDEX_VERSION} search index")
+        index = cls()
+        index.postings = {sys.intern(t): entry for t, entry in data['postings'].items()}
+        index.doc_lengths = data['doc_lengths']
+        index._total_length = sum(index.doc_lengths)
+        index.source_sha256 = data['source_sha256']
+        index.sections = data.get('sections')
+        return index
+
+
+def _has_phrase(tokens: list[str], phrase: list[str]) -> bool:
+    n = len(phrase)
+    first = phrase[0]
+    for i, t in enumerate(tokens):
+        if t == first and tokens[i:i + n] == phrase:
+            return True
+    return False
+
+
+class _Contents:
+    """Adapts a quote store to the `contents[doc]` access search() needs"""
+
+    def __init__(self, quotes):
+        self.quotes = quotes
+
+    def __getitem__(self, doc: int) -> str:
+        content = getattr(self.quotes, "content", None)
+        return content(doc) if content is not None else self.quotes[doc].content
+
+
+_index: SearchIndex | None = None
+_index_generation = -1
+
+
+def load_or_build(quotes, file_path: str, cache_path: str) -> SearchIndex:
+    """The saved index for `quotes`, brought up to date and saved if it was not.
+
+    The saved index records the sha256 and section checkpoints of the source
+    text in `cache_path` (see quote.load_corpus) it was built from. When the
+    source changed, documents from the first changed section on are dropped
+    and only the quotes from there are indexed again, so appending to the
+    text costs time for the new quotes only.
+    """
+    meta = quote._read_cache_meta(cache_path)
+    source_sha256 = meta.get('source', {}).get('sha256')
+    sections = meta.get('sections')
+    try:
+        index = SearchIndex.load(file_path)
+    except (OSError, ValueError, pickle.UnpicklingError, EOFError, KeyError):
+        index = SearchIndex()
+    if index.source_sha256 == source_sha256 and len(index) == len(quotes):
+        return index
+    index.truncate(quote._unchanged_count(index.sections, sections) if source_sha256 else 0)
+    contents = _Contents(quotes)
+    for i in range(len(index), len(quotes)):
+        index.add(contents[i])
+    index.source_sha256 = source_sha256
+    index.sections = sections
+    try:
+        index.save(file_path)
+    except OSError as e:
+        print(f"Error saving search index '{file_path}': {e}")
+    return index
+
+
+def get_index(file_path: str = _index_file) -> SearchIndex:
+    """Return the index for quote_list, loading it from disk when it is current.
+
+    The index is kept until quote.reload_quote_list() loads new quotes.
+    """
+    global _index, _index_generation
+    quotes = quote.get_quote_list()
+    if _index is not None and _index_generation == quote.generation:
+        return _index
+    _index = load_or_build(quotes, file_path, quote._cache_file)
+    _index_generation = quote.generation
+    return _index
+
+
+def search(query: str, limit: int = 10) -> list[_quote]:
+    """Quotes matching `query`, best first"""
+    quotes = quote.get_quote_list()
+    hits = get_index().search(query, limit, _Contents(quotes))
+    return [quotes[doc] for _, doc in hits]
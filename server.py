@@ -0,0 +1,244 @@
+"""Local HTTP quote service on asyncio.
+
+    python server.py [--host 127.0.0.1] [--port 8067]
+
+Endpoints (all GET, JSON responses):
+    /daily                      today's quote, same selection as the notifier
+    /random?year=&speaker=&weighted=
+                                a random quote, optionally from one year,
+                                by "student" or "teacher", or favouring newer
+                                ones (see sampler.py)
+    /quote/{id}                 one quote by its stable id (see quote.stable_id)
+    /quotes?ids=1,2,...         several quotes by id, unknown ids left out
+                                (at most MAX_IDS per request)
+    /manifest                   the ids of every quote, in corpus order
+    /search?q=...&limit=10      full-text search (see search.py)
+    /range?start=YYYY-MM-DD&end=YYYY-MM-DD
+                                quotes dated in a range (see dateindex.py);
+                                month and day may be left off either bound
+
+Every quote's JSON body and ETag are built once and reused, so serving a
+quote is a dict lookup and one write. Connections are kept alive (HTTP/1.1)
+and conditional requests with If-None-Match get 304 Not Modified.
+
+A mirror (see mirror.py) polls /manifest with its ETag: an unchanged corpus
+costs a 304, and after an update it downloads only the quotes whose ids it
+does not have yet.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import quote
+from dateindex import DateIndex
+from render import render
+
+MAX_IDS = 1000
+_reasons = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            500: "Internal Server Error"}
+
+
+class Response:
+    """A fully serialized response: headers and body bytes, plus its ETag"""
+    __slots__ = ("status", "body", "etag", "_head")
+
+    def __init__(self, status: int, body: bytes):
+        self.status = status
+        self.body = body
+        self.etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        self._head = (f"HTTP/1.1 {status} {_reasons[status]}\r\n"
+                      f"Content-Type: application/json; charset=utf-8\r\n"
+                      f"Content-Length: {len(body)}\r\n"
+                      f"ETag: {self.etag}\r\n").encode('ascii')
+
+    def encode(self, keep_alive: bool, if_none_match: str | None, head_only: bool = False) -> bytes:
+        connection = b"Connection: keep-alive\r\n\r\n" if keep_alive else b"Connection: close\r\n\r\n"
+        if if_none_match is not None and self.etag in if_none_match and self.status == 200:
+            return (f"HTTP/1.1 304 Not Modified\r\nETag: {self.etag}\r\n").encode('ascii') + connection
+        return self._head + connection + (b"" if head_only else self.body)
+
+
+def _error(status: int, message: str) -> Response:
+    return Response(status, json.dumps({"error": message}).encode('utf-8'))
+
+
+def _parse_date(text: str) -> tuple:
+    return tuple(int(p) for p in text.split("-"))
+
+
+class QuoteService:
+    def __init__(self, manager):
+        self.manager = manager
+        self._quotes = None
+        self._bodies: dict[int, bytes] = {}
+        self._responses: dict[int, Response] = {}
+        self._date_index: DateIndex | None = None
+        self._daily: tuple[object, int, Response] | None = None
+        self._manifest: Response | None = None
+
+    def _store(self):
+        quotes = self.manager.quotes
+        if quotes is not self._quotes:
+            # The updater swapped in new quotes; drop everything derived from the old ones
+            self._quotes = quotes
+            self._bodies.clear()
+            self._responses.clear()
+            self._date_index = None
+            self._daily = None
+            self._manifest = None
+        return quotes
+
+    def _body(self, index: int) -> bytes:
+        body = self._bodies.get(index)
+        if body is None:
+            q = self._quotes[index]
+            data = q.to_dict()
+            data["text"] = render(q, "plain")
+            body = self._bodies[index] = json.dumps(data).encode('utf-8')
+        return body
+
+    def _quote_response(self, index: int) -> Response:
+        response = self._responses.get(index)
+        if response is None:
+            response = self._responses[index] = Response(200, self._body(index))
+        return response
+
+    def _list_response(self, indices) -> Response:
+        return Response(200, b'{"quotes": [' + b", ".join(self._body(i) for i in indices) + b"]}")
+
+    def daily(self) -> Response:
+        self._store()
+        q = self.manager.get_daily_quote()
+        key = (self.manager.last_date, q.id)
+        if self._daily is None or self._daily[:2] != key:
+            self._daily = (*key, self._quote_response(self._quotes.find(q.id)))
+        return self._daily[2]
+
+    def manifest(self) -> Response:
+        if self._manifest is None:
+            ids = quote.manifest(self._quotes)
+            body = f'{{"count": {len(ids)}, "ids": [{", ".join(map(str, ids))}]}}'
+            self._manifest = Response(200, body.encode('ascii'))
+        return self._manifest
+
+    def handle(self, path: str) -> Response:
+        url = urlsplit(path)
+        route = url.path.rstrip("/") or "/"
+        quotes = self._store()
+        if route == "/daily":
+            return self.daily()
+        if route.startswith("/quote/"):
+            try:
+                id = int(unquote(route[len("/quote/"):]))
+            except ValueError:
+                return _error(400, "id must be an integer")
+            index = quotes.find(id)
+            if index < 0:
+                return _error(404, f"no quote with id {id}")
+            return self._quote_response(index)
+        if route == "/manifest":
+            return self.manifest()
+        params = parse_qs(url.query)
+        if route == "/quotes":
+            try:
+                ids = [int(i) for i in params.get("ids", [""])[0].split(",") if i]
+            except ValueError:
+                return _error(400, "ids must be comma-separated integers")
+            if len(ids) > MAX_IDS:
+                return _error(400, f"at most {MAX_IDS} ids per request")
+            return self._list_response(i for i in map(quotes.find, ids) if i >= 0)
+        if route == "/random":
+            try:
+                year = int(params["year"][0]) if "year" in params else None
+                speaker = params.get("speaker", [None])[0]
+                weighted = params.get("weighted", ["0"])[0] not in ("0", "false", "")
+                return self._quote_response(self.manager.sampler.sample(year, speaker, weighted))
+            except ValueError as e:
+                return _error(400, str(e))
+            except LookupError as e:
+                return _error(404, str(e))
+        if route == "/search":
+            from search import get_index, _Contents
+            q = params.get("q", [""])[0]
+            try:
+                limit = min(int(params.get("limit", ["10"])[0]), 100)
+            except ValueError:
+                return _error(400, "limit must be an integer")
+            hits = get_index().search(q, limit, _Contents(quotes))
+            return self._list_response(doc for _, doc in hits)
+        if route == "/range":
+            try:
+                start = _parse_date(params["start"][0])
+                end = _parse_date(params.get("end", params["start"])[0])
+            except (KeyError, ValueError):
+                return _error(400, "start (and optional end) must look like YYYY[-MM[-DD]]")
+            if self._date_index is None:
+                self._date_index = DateIndex(quotes)
+            return self._list_response(self._date_index.between_indices(start, end))
+        return _error(404, f"unknown path {url.path}")
+
+    async def serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lines = head.decode('latin-1').split("\r\n")
+                try:
+                    method, path, version = lines[0].split(" ", 2)
+                except ValueError:
+                    writer.write(_error(400, "bad request line").encode(False, None))
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(":")
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" and (version == "HTTP/1.1" or connection == "keep-alive")
+                if method not in ("GET", "HEAD"):
+                    response = _error(405, "only GET is supported")
+                else:
+                    try:
+                        response = self.handle(path)
+                    except Exception as e:
+                        # handle() answers bad input itself; anything else is our fault, and its
+                        # details stay in the log
+                        print(f"Error handling {path}: {e!r}")
+                        response = _error(500, "internal server error")
+                writer.write(response.encode(keep_alive, headers.get("if-none-match"), method == "HEAD"))
+                if not keep_alive:
+                    break
+                if writer.transport.get_write_buffer_size() > 1 << 16:
+                    await writer.drain()
+        finally:
+            writer.close()
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8067, manager=None) -> None:
+    if manager is None:
+        from dailyquote import PersistentQuoteManager
+        manager = PersistentQuoteManager(quote.get_quote_list())
+    service = QuoteService(manager)
+    server = await asyncio.start_server(service.serve_connection, host, port, backlog=1024)
+    print(f"Serving {len(manager.quotes)} quotes on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve quotes over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8067)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\nStopping quote server...")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Per-subscriber daily quote state.
+
+A state is a small JSON-compatible dict such as
+{'last_date': '2025-11-17', 'last_quote_id': 322688091414349}. Backends
+store one per subscriber:
+
+- JsonStateBackend: the original single-file `quote_data.json`, now written
+  atomically. Only holds one subscriber's state.
+- SQLiteStateBackend: one row per subscriber in a WAL-mode database. Each
+  write is committed right away unless `batch_size` asks for batches (bulk
+  updates), and recently used states are kept in an in-memory LRU so hot
+  subscribers never hit the database. Batched writes still pending at exit
+  are flushed then.
+"""
+import atexit
+from collections import OrderedDict
+import json
+import os
+import threading
+
+
+class StateBackend:
+    def get(self, subscriber: str) -> dict | None:
+        raise NotImplementedError
+
+    def set(self, subscriber: str, state: dict) -> None:
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+
+class JsonStateBackend(StateBackend):
+    def __init__(self, data_file: str = "quote_data.json"):
+        self.data_file = data_file
+
+    def get(self, subscriber: str) -> dict | None:
+        try:
+            with open(self.data_file, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except json.JSONDecodeError:
+            # File exists but corrupted, start fresh
+            return None
+
+    def set(self, subscriber: str, state: dict) -> None:
+        tmp_path = self.data_file + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.data_file)
+
+
+class SQLiteStateBackend(StateBackend):
+    def __init__(self, path: str = "quote_state.db", batch_size: int = 1, cache_size: int = 10000):
+        self.path = path
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self._lock = threading.RLock()
+        self._cache: OrderedDict[str, dict] = OrderedDict()
+        self._pending: dict[str, dict] = {}
+        import sqlite3
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS state (subscriber TEXT PRIMARY KEY, data TEXT NOT NULL)")
+        self._closed = False
+        atexit.register(self.close)
+
+    def _remember(self, subscriber: str, state: dict) -> None:
+        cache = self._cache
+        cache[subscriber] = state
+        cache.move_to_end(subscriber)
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+
+    def get(self, subscriber: str) -> dict | None:
+        with self._lock:
+            state = self._cache.get(subscriber)
+            if state is not None:
+                self._cache.move_to_end(subscriber)
+                return state
+            state = self._pending.get(subscriber)
+            if state is None:
+                row = self._conn.execute(
+                    "SELECT data FROM state WHERE subscriber = ?", (subscriber,)).fetchone()
+                if row is None:
+                    return None
+                state = json.loads(row[0])
+            self._remember(subscriber, state)
+            return state
+
+    def get_many(self, subscribers: list[str]) -> dict[str, dict]:
+        """States for many subscribers with one query per 500 cache misses"""
+        out: dict[str, dict] = {}
+        missing = []
+        with self._lock:
+            for s in subscribers:
+                state = self._cache.get(s) or self._pending.get(s)
+                if state is not None:
+                    out[s] = state
+                else:
+                    missing.append(s)
+            for i in range(0, len(missing), 500):
+                chunk = missing[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT subscriber, data FROM state WHERE subscriber IN ({','.join('?' * len(chunk))})",
+                    chunk).fetchall()
+                for s, data in rows:
+                    out[s] = json.loads(data)
+        return out
+
+    def set(self, subscriber: str, state: dict) -> None:
+        with self._lock:
+            self._remember(subscriber, state)
+            self._pending[subscriber] = state
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write all buffered states in one transaction"""
+        with self._lock:
+            if not self._pending:
+                return
+            rows = [(s, json.dumps(state)) for s, state in self._pending.items()]
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO state (subscriber, data) VALUES (?, ?) "
+                    "ON CONFLICT(subscriber) DO UPDATE SET data = excluded.data", rows)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            self._pending.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self.flush()
+            self._conn.close()
+            self._closed = True
+        atexit.unregister(self.close)
@@ -0,0 +1,236 @@
+"""Lightweight instrumentation: counters and latency histograms.
+
+Off by default. While disabled, a @timed function costs one global lookup
+and a branch per call, and timer() hands back a shared no-op context
+manager, so the hooks can stay in the hot paths. enable() turns collection
+on for the whole process.
+
+    stats.enable()
+    with stats.timer("git", command="pull"):
+        ...
+    print(stats.report())
+    stats.write_prometheus("quotes.prom")
+
+Timers feed histograms exported as jordiquotes_<name>_seconds; counters are
+exported as jordiquotes_<name>_total.
+"""
+from bisect import bisect_left
+import functools
+import os
+import threading
+import time
+
+PREFIX = "jordiquotes_"
+BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+enabled = False
+_lock = threading.Lock()
+_counters: dict[tuple[str, tuple], float] = {}
+_histograms: dict[tuple[str, tuple], 'Histogram'] = {}
+
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+
+def enable() -> None:
+    global enabled
+    enabled = True
+
+
+def disable() -> None:
+    global enabled
+    enabled = False
+
+
+def reset() -> None:
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def _key(name: str, labels: dict) -> tuple[str, tuple]:
+    return name, tuple(sorted(labels.items()))
+
+
+def incr(name: str, value: float = 1, **labels) -> None:
+    if not enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name: str, seconds: float, **labels) -> None:
+    if not enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = Histogram()
+        hist.observe(seconds)
+
+
+class _Timer:
+    __slots__ = ("name", "labels", "start")
+
+    def __init__(self, name: str, labels: dict):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_null_timer = _NullTimer()
+
+
+def timer(name: str, **labels):
+    """Context manager recording the block's wall time under `name`"""
+    return _Timer(name, labels) if enabled else _null_timer
+
+
+def timed(name: str):
+    """Decorator recording every call's wall time under `name`"""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return fn(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - t0)
+        return wrapper
+    return decorate
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(labels: tuple, extra: str = "") -> str:
+    parts = [f'{k}="{_escape(v)}"' for k, v in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def snapshot() -> dict:
+    """Current counters and histogram summaries, keyed by name{labels}"""
+    with _lock:
+        counters = {name + _label_text(labels): value for (name, labels), value in _counters.items()}
+        timers = {name + _label_text(labels): {"count": h.count, "sum_s": h.sum, "max_s": h.max}
+                  for (name, labels), h in _histograms.items()}
+    return {"counters": counters, "timers": timers}
+
+
+def report() -> str:
+    """Human-readable table for --stats"""
+    data = snapshot()
+    if not data["counters"] and not data["timers"]:
+        return "No stats recorded."
+    lines = []
+    if data["timers"]:
+        lines.append(f"{'timer':<40} {'count':>7} {'total ms':>11} {'mean ms':>10} {'max ms':>10}")
+        for name, t in sorted(data["timers"].items()):
+            mean = t["sum_s"] / t["count"] if t["count"] else 0.0
+            lines.append(f"{name:<40} {t['count']:>7} {t['sum_s'] * 1000:>11.2f} "
+                         f"{mean * 1000:>10.2f} {t['max_s'] * 1000:>10.2f}")
+    if data["counters"]:
+        lines.append(f"{'counter':<40} {'value':>7}")
+        for name, value in sorted(data["counters"].items()):
+            lines.append(f"{name:<40} {value:>7g}")
+    return "\n".join(lines)
+
+
+def prometheus_text() -> str:
+    """All metrics in the Prometheus text exposition format"""
+    out = []
+    with _lock:
+        counters = sorted(_counters.items())
+        histograms = sorted((key, list(h.counts), h.sum, h.count) for key, h in _histograms.items())
+    typed = set()
+    for (name, labels), value in counters:
+        metric = f"{PREFIX}{name}_total"
+        if metric not in typed:
+            typed.add(metric)
+            out.append(f"# TYPE {metric} counter")
+        out.append(f"{metric}{_label_text(labels)} {value:g}")
+    for (name, labels), counts, total, count in histograms:
+        metric = f"{PREFIX}{name}_seconds"
+        if metric not in typed:
+            typed.add(metric)
+            out.append(f"# TYPE {metric} histogram")
+        cumulative = 0
+        for bound, n in zip(BUCKETS + (float("inf"),), counts):
+            cumulative += n
+            le = "+Inf" if bound == float("inf") else f"{bound:g}"
+            bucket_labels = _label_text(labels, 'le="' + le + '"')
+            out.append(f"{metric}_bucket{bucket_labels} {cumulative}")
+        out.append(f"{metric}_sum{_label_text(labels)} {total:.9g}")
+        out.append(f"{metric}_count{_label_text(labels)} {count}")
+    return "\n".join(out) + "\n"
+
+
+def write_prometheus(path: str) -> None:
+    """Write prometheus_text() atomically, e.g. for node_exporter's textfile collector"""
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            f.write(prometheus_text())
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Error writing stats to '{path}': {e}")
+
+
+def profile_once(fn, path: str):
+    """Wrap `fn` so its first call runs under cProfile, saved to `path`"""
+    done = False
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        nonlocal done
+        if done:
+            return fn(*args, **kwargs)
+        done = True
+        import cProfile
+        import pstats
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(fn, *args, **kwargs)
+        finally:
+            profiler.dump_stats(path)
+            print(f"Profile of one cycle saved to {path}")
+            pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
+    return wrapper
@@ -0,0 +1,98 @@
+"""Background quote updates.
+
+QuoteUpdater runs `git pull` for the repository on a worker thread, with a
+timeout on every git call, and only fetches when the remote HEAD differs from
+the local one. When the pull changes `Jordi's Famous quotes.txt`, the corpus
+is re-extracted (incrementally, see quote.extract_incremental) and handed to
+`on_reload`, which swaps it into the running process. Nothing here ever
+blocks quote selection.
+"""
+import subprocess
+import threading
+from typing import Callable
+
+import quote
+import stats
+
+
+class QuoteUpdater:
+    def __init__(self, on_reload: Callable[[object], None], repo_dir: str = quote._here,
+                 interval: float = 60 * 60, timeout: float = 30):
+        self.on_reload = on_reload
+        self.repo_dir = repo_dir
+        self.interval = interval
+        self.timeout = timeout
+        self.last_error: str | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._source_fp: dict | None = None
+
+    def _git(self, *args: str) -> str | None:
+        """Run git with a timeout; return stdout, or None on any failure"""
+        try:
+            with stats.timer("git", command=args[0]):
+                result = subprocess.run(["git", *args], cwd=self.repo_dir, capture_output=True,
+                                        text=True, timeout=self.timeout)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            self.last_error = f"git {args[0]}: {e}"
+            stats.incr("git_errors", command=args[0])
+            return None
+        if result.returncode != 0:
+            self.last_error = f"git {args[0]}: {result.stderr.strip()}"
+            stats.incr("git_errors", command=args[0])
+            return None
+        return result.stdout
+
+    def _remote_changed(self) -> bool:
+        remote = self._git("ls-remote", "origin", "HEAD")
+        local = self._git("rev-parse", "HEAD")
+        if remote is None or local is None:
+            return False
+        return remote.split()[0] != local.strip() if remote.strip() else False
+
+    def _source_changed(self) -> bool:
+        try:
+            fp = quote._fingerprint(quote._source_file, self._source_fp)
+        except OSError:
+            return False
+        previous = self._source_fp
+        self._source_fp = fp
+        return previous is not None and fp['sha256'] != previous['sha256']
+
+    @stats.timed("updater_check")
+    def check_once(self) -> bool:
+        """Pull if the remote moved and reload if the quotes changed.
+
+        Returns True if new quotes were loaded.
+        """
+        if self._source_fp is None:
+            self._source_changed()
+        if self._remote_changed():
+            self._git("pull", "--ff-only")
+        if not self._source_changed():
+            return False
+        quotes = quote.reload_quote_list()
+        self.on_reload(quotes)
+        stats.incr("updater_reloads")
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if self.check_once():
+                    print("Quotes updated in the background.")
+            except Exception as e:
+                self.last_error = str(e)
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="quote-updater", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 5) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)